@@ -6,52 +6,499 @@ Examples:
   python3 skills/blueprint-onboard/scripts/blueprint_cli.py story-done --id US-202
   python3 skills/blueprint-onboard/scripts/blueprint_cli.py story-update --id US-202 --status doing --progress 60
   python3 skills/blueprint-onboard/scripts/blueprint_cli.py validate
+  python3 skills/blueprint-onboard/scripts/blueprint_cli.py serve [--socket /tmp/blueprint.sock]
+  python3 skills/blueprint-onboard/scripts/blueprint_cli.py watch [--interval 0.5] [--debounce 0.3]
+  python3 skills/blueprint-onboard/scripts/blueprint_cli.py query --capability C-012 [--count-by milestone]
+  python3 skills/blueprint-onboard/scripts/blueprint_cli.py graph
+  kanban-export | python3 skills/blueprint-onboard/scripts/blueprint_cli.py batch --input -
+
+Server mode reads one JSON request per line and answers with one JSON line:
+  {"cmd": "story-update", "id": "US-202", "status": "doing", "progress": 60}
+  {"cmd": "story-done", "id": "US-202"}
+  {"cmd": "validate"}
+  {"cmd": "reload"}
+  {"cmd": "shutdown"}
 """
 
 from __future__ import annotations
 
 import argparse
 import json
-import subprocess
-import tempfile
+import os
+import sys
+import time
 from pathlib import Path
-from typing import Any, Dict
-
-
-def run(cmd: list[str]) -> int:
-    proc = subprocess.run(cmd, capture_output=True, text=True)
-    if proc.stdout:
-        print(proc.stdout.strip())
-    if proc.stderr:
-        print(proc.stderr.strip())
-    return proc.returncode
+from typing import Any, Dict, Iterable, List, TextIO, Tuple
 
 
-def build_story_patch(args: argparse.Namespace) -> Dict[str, Any]:
-    story: Dict[str, Any] = {"id": args.id}
+def story_patch_from_fields(fields: Dict[str, Any]) -> Dict[str, Any]:
+    story: Dict[str, Any] = {"id": fields["id"]}
 
-    if args.done:
+    if fields.get("done"):
         story["status"] = "done"
         story["progress"] = 100
     else:
-        if args.status is not None:
-            story["status"] = args.status
-        if args.progress is not None:
-            story["progress"] = args.progress
+        if fields.get("status") is not None:
+            story["status"] = fields["status"]
+        if fields.get("progress") is not None:
+            story["progress"] = fields["progress"]
 
     for k in ["title", "epic", "capability", "milestone"]:
-        v = getattr(args, k, None)
+        v = fields.get(k)
         if v:
             story[k] = v
 
     return {"stories": [story]}
 
 
-def main() -> int:
-    here = Path(__file__).resolve().parent
-    apply_script = here / "apply_blueprint_merge.py"
-    validate_script = here / "validate_blueprint.py"
+def build_story_patch(args: argparse.Namespace) -> Dict[str, Any]:
+    return story_patch_from_fields(vars(args))
+
+
+PATCH_TYPES = {"story": "US-", "capability": "C-", "external": "EXT-", "milestone": "M-"}
+
+
+def patch_type(patch: Dict[str, Any]) -> str | None:
+    declared = patch.get("type")
+    if declared is not None:
+        return declared if declared in PATCH_TYPES else None
+    entity_id = str(patch.get("id", ""))
+    for name, prefix in PATCH_TYPES.items():
+        if entity_id.startswith(prefix):
+            return name
+    return None
+
+
+def list_field(container: Dict[str, Any], key: str, lineno: int, prefix: str = "") -> List[Any]:
+    value = container.get(key)
+    if value is None:
+        return []
+    if not isinstance(value, list):
+        raise ValueError(f"line {lineno}: {prefix}{key} must be a list")
+    return value
+
+
+def collect_batch_patches(lines: Iterable[str]) -> Dict[str, Any]:
+    """Fold a JSON-lines stream of patches into one incoming model.
+
+    Each line is either a single entity patch, typed by `type` or by its id
+    prefix (`US-`/`C-`/`EXT-`/`M-`), or a partial model with `stories`,
+    `dependencies` and/or `milestones`. Patches for the same id are combined
+    in stream order, later fields winning. A line that contributes no entity,
+    or whose sections have the wrong shape, raises ValueError.
+    """
+    buckets: Dict[str, Dict[str, Dict[str, Any]]] = {name: {} for name in PATCH_TYPES}
+    edges: List[Any] = []
+
+    def add(kind: str, entity: Any, lineno: int) -> None:
+        if not isinstance(entity, dict) or not str(entity.get("id", "")).strip():
+            raise ValueError(f"line {lineno}: {kind} patch needs an id")
+        fields = {k: v for k, v in entity.items() if k != "type"}
+        if kind == "story" and fields.pop("done", False):
+            fields["status"] = "done"
+            fields["progress"] = 100
+        buckets[kind].setdefault(str(fields["id"]).strip(), {}).update(fields)
+
+    for lineno, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            patch = json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"line {lineno}: invalid json: {exc}") from exc
+        if not isinstance(patch, dict):
+            raise ValueError(f"line {lineno}: patch must be a JSON object")
+
+        if "id" in patch:
+            kind = patch_type(patch)
+            if kind is None:
+                raise ValueError(f"line {lineno}: cannot tell patch type for id {patch.get('id')!r}")
+            add(kind, patch, lineno)
+            continue
+
+        deps = patch.get("dependencies")
+        if deps is None:
+            deps = {}
+        elif not isinstance(deps, dict):
+            raise ValueError(f"line {lineno}: dependencies must be an object")
+        sections = [
+            ("story", list_field(patch, "stories", lineno)),
+            ("milestone", list_field(patch, "milestones", lineno)),
+            ("capability", list_field(deps, "capabilities", lineno, "dependencies.")),
+            ("external", list_field(deps, "externals", lineno, "dependencies.")),
+        ]
+        line_edges = list_field(deps, "edges", lineno, "dependencies.")
+        if not line_edges and not any(entities for _, entities in sections):
+            # e.g. a typo'd key such as "story_id" would otherwise drop the update silently
+            raise ValueError(f"line {lineno}: patch has no id and no stories, milestones or dependencies entries")
+        for kind, entities in sections:
+            for entity in entities:
+                add(kind, entity, lineno)
+        for edge in line_edges:
+            if not isinstance(edge, dict) or not str(edge.get("from", "")).strip() or not str(edge.get("to", "")).strip():
+                raise ValueError(f"line {lineno}: dependency edge needs from and to")
+            edges.append(edge)
+
+    incoming: Dict[str, Any] = {}
+    if buckets["story"]:
+        incoming["stories"] = list(buckets["story"].values())
+    if buckets["milestone"]:
+        incoming["milestones"] = list(buckets["milestone"].values())
+    if buckets["capability"] or buckets["external"] or edges:
+        incoming["dependencies"] = {
+            "capabilities": list(buckets["capability"].values()),
+            "externals": list(buckets["external"].values()),
+            "edges": edges,
+        }
+    return incoming
+
+
+def run_batch(blueprint_dir: Path, lines: Iterable[str], on_conflict: str, dry_run: bool) -> int:
+    from apply_blueprint_merge import dumps_json, run_merge, validate_merged
+
+    try:
+        incoming = collect_batch_patches(lines)
+    except ValueError as exc:
+        print(json.dumps({"status": "error", "message": str(exc)}, ensure_ascii=False, indent=2))
+        return 1
+
+    out, _, generated = run_merge(
+        blueprint_dir,
+        incoming,
+        mode="append",
+        on_conflict=on_conflict,
+        resolutions={},
+        dry_run=dry_run,
+    )
+    out["patches"] = {
+        "stories": len(incoming.get("stories", [])),
+        "capabilities": len(incoming.get("dependencies", {}).get("capabilities", [])),
+        "externals": len(incoming.get("dependencies", {}).get("externals", [])),
+        "milestones": len(incoming.get("milestones", [])),
+    }
+    if out["status"] == "needs_resolution":
+        print(dumps_json(out))
+        return 2
+
+    out["validation"] = validate_merged(blueprint_dir, generated, dry_run)
+    print(dumps_json(out))
+    return 0 if out["validation"]["status"] == "ok" else 1
+
+
+def run_story_patch(blueprint_dir: Path, payload: Dict[str, Any], on_conflict: str, dry_run: bool) -> int:
+    """Merge a story patch and validate in this process (same output as apply_blueprint_merge --validate)."""
+    from apply_blueprint_merge import dumps_json, run_merge, validate_merged
+
+    out, _, generated = run_merge(
+        blueprint_dir,
+        payload,
+        mode="append",
+        on_conflict=on_conflict,
+        resolutions={},
+        dry_run=dry_run,
+    )
+    if out["status"] == "needs_resolution":
+        print(dumps_json(out))
+        return 2
+    out["validation"] = validate_merged(blueprint_dir, generated, dry_run)
+    print(dumps_json(out))
+    return 0 if out["validation"]["status"] == "ok" else 1
+
+
+class BlueprintSession:
+    """Keeps the parsed model in memory between requests."""
+
+    def __init__(self, blueprint_dir: Path) -> None:
+        self.blueprint_dir = blueprint_dir
+        self.closed = False
+        self.reload()
+
+    def reload(self) -> None:
+        from staged_writes import blueprint_lock
+
+        with blueprint_lock(self.blueprint_dir):
+            self._load()
+
+    def _load(self) -> None:
+        """Re-read the model from disk; the caller holds the blueprint lock."""
+        from apply_blueprint_merge import build_existing_model, read_model_etag
+        from staged_writes import recover_staged_writes
+        from validate_blueprint import BlueprintDocs
+
+        recover_staged_writes(self.blueprint_dir)
+        self.etag = read_model_etag(self.blueprint_dir)
+        self.model = build_existing_model(self.blueprint_dir)
+        self.docs = BlueprintDocs(self.blueprint_dir)
+
+    def apply_edits(self, changed: List[str]) -> Dict[str, Any]:
+        """Fold hand edits of `changed` (relative paths) into the warm model.
+
+        Story frontmatter edits are merged into the in-memory model and only
+        the views derived from stories are re-rendered; the edited story files
+        themselves are never rewritten. Edits to other views reload the model
+        from disk; story edits in the same burst still re-render the story
+        views. The `US-xxx.md` template is never folded in as a story. Either
+        way the blueprint is re-validated, re-parsing only the changed files.
+        """
+        from staged_writes import blueprint_lock
+        from validate_blueprint import validate_docs, validation_report
+
+        with blueprint_lock(self.blueprint_dir):
+            written = self._fold_edits(changed)
+        self.docs.invalidate(changed)
+        return {
+            "status": "ok",
+            "changed": changed,
+            "written_files": written,
+            "validation": validation_report(validate_docs(self.docs)),
+        }
+
+    def _fold_edits(self, changed: List[str]) -> List[str]:
+        from apply_blueprint_merge import (
+            apply_managed_files,
+            is_story_output,
+            model_state_files,
+            read_model_etag,
+            render_in_memory,
+        )
+        from render_blueprint import output_paths
+        from story_loader import STORY_TEMPLATE_NAME, parse_story_file
+
+        # The US-xxx.md template is a managed view, not a story.
+        story_edits = [
+            rel for rel in changed if is_story_output(rel) and Path(rel).name != STORY_TEMPLATE_NAME
+        ]
+        if len(story_edits) < len(changed) or read_model_etag(self.blueprint_dir) != self.etag:
+            # Other views changed, or another writer committed since the model
+            # was loaded: reload from disk, which also picks up the story edits.
+            self._load()
+            if not story_edits:
+                return []
+        else:
+            edited: Dict[str, Dict[str, Any] | None] = {}
+            for rel in story_edits:
+                path = self.blueprint_dir / rel
+                fm = parse_story_file(path)[0] if path.exists() else None
+                edited[path.stem] = fm if isinstance(fm, dict) else None
+
+            stories = []
+            for story in self.model.get("stories", []):
+                sid = str(story.get("id", "")) if isinstance(story, dict) else ""
+                if sid not in edited:
+                    stories.append(story)
+                elif edited[sid] is not None:
+                    stories.append({**story, **edited.pop(sid)})
+            stories.extend(fm for fm in edited.values() if fm is not None)
+            self.model = {**self.model, "stories": stories}
 
+        generated = render_in_memory(self.model, {"stories"}, set())
+        etag, derived = model_state_files(self.blueprint_dir, self.model, output_paths(self.model))
+        written, _ = apply_managed_files(self.blueprint_dir, generated, "append", dry_run=False, derived=derived)
+        self.etag = etag
+        self.docs.invalidate(list(generated))
+        return written
+
+    def story_update(self, req: Dict[str, Any]) -> Dict[str, Any]:
+        from apply_blueprint_merge import run_merge, validate_merged
+
+        if not str(req.get("id", "")).strip():
+            return {"status": "error", "message": "missing story id"}
+        if req.get("cmd") == "story-done":
+            patch = story_patch_from_fields({"id": req["id"], "done": True})
+        else:
+            patch = story_patch_from_fields(req)
+
+        dry_run = bool(req.get("dry_run", False))
+        out, merged, generated = run_merge(
+            self.blueprint_dir,
+            patch,
+            mode="append",
+            on_conflict=str(req.get("on_conflict", "keep_old")),
+            resolutions={},
+            dry_run=dry_run,
+            existing=self.model,
+            etag=self.etag,
+        )
+        if out["status"] == "ok" and not dry_run:
+            self.model = merged
+            self.etag = out["etag"]
+            if out["attempts"] > 1:
+                # Another writer's commit landed first; its files are not in `generated`.
+                from validate_blueprint import BlueprintDocs
+
+                self.docs = BlueprintDocs(self.blueprint_dir)
+            else:
+                self.docs.invalidate(list(generated))
+        if req.get("validate") and out["status"] != "needs_resolution":
+            out["validation"] = validate_merged(self.blueprint_dir, generated, dry_run)
+        return out
+
+    def validate(self) -> Dict[str, Any]:
+        from validate_blueprint import validate_blueprint_dir, validation_report
+
+        return validation_report(validate_blueprint_dir(self.blueprint_dir))
+
+    def handle(self, req: Any) -> Dict[str, Any]:
+        if not isinstance(req, dict):
+            return {"status": "error", "message": "request must be a JSON object"}
+        cmd = req.get("cmd")
+        try:
+            if cmd in {"story-update", "story-done"}:
+                return self.story_update(req)
+            if cmd == "validate":
+                return self.validate()
+            if cmd == "reload":
+                self.reload()
+                return {"status": "ok", "stories": len(self.model.get("stories", []))}
+            if cmd == "shutdown":
+                self.closed = True
+                return {"status": "ok"}
+        except Exception as exc:
+            return {"status": "error", "message": f"{type(exc).__name__}: {exc}"}
+        return {"status": "error", "message": f"unknown cmd: {cmd}"}
+
+    def handle_line(self, line: str) -> str:
+        try:
+            req = json.loads(line)
+        except json.JSONDecodeError as exc:
+            resp = {"status": "error", "message": f"invalid json: {exc}"}
+        else:
+            resp = self.handle(req)
+        return json.dumps(resp, ensure_ascii=False, default=str)
+
+
+def serve_stream(session: BlueprintSession, reader: TextIO, writer: TextIO) -> None:
+    for line in reader:
+        if not line.strip():
+            continue
+        writer.write(session.handle_line(line) + "\n")
+        writer.flush()
+        if session.closed:
+            break
+
+
+def serve_socket(session: BlueprintSession, socket_path: Path) -> None:
+    import socketserver
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            for raw in self.rfile:
+                line = raw.decode("utf-8")
+                if not line.strip():
+                    continue
+                self.wfile.write((session.handle_line(line) + "\n").encode("utf-8"))
+                self.wfile.flush()
+                if session.closed:
+                    break
+
+    socket_path.unlink(missing_ok=True)
+    # Requests are handled one at a time, so merges never interleave.
+    with socketserver.UnixStreamServer(str(socket_path), Handler) as server:
+        try:
+            while not session.closed:
+                server.handle_request()
+        finally:
+            socket_path.unlink(missing_ok=True)
+
+
+def run_query(blueprint_dir: Path, filters: Dict[str, str | None], count_by: str | None) -> int:
+    from story_index import count_stories, load_story_index, query_stories, save_story_index
+
+    source = "index"
+    index = load_story_index(blueprint_dir)
+    if index is None:
+        # Missing or stale (story files edited by hand): rebuild once from the blueprint.
+        from apply_blueprint_merge import build_existing_model
+
+        if not (blueprint_dir / "Stories").exists():
+            print(json.dumps({"status": "error", "message": f"no Stories dir in {blueprint_dir}"}, ensure_ascii=False))
+            return 1
+        stories = build_existing_model(blueprint_dir).get("stories", [])
+        index = save_story_index(blueprint_dir, stories)
+        source = "rebuilt"
+
+    rows = query_stories(index, **filters)
+    out: Dict[str, Any] = {"status": "ok", "source": source, "count": len(rows)}
+    if count_by:
+        out["counts"] = count_stories(rows, count_by)
+    else:
+        out["stories"] = rows
+    print(json.dumps(out, ensure_ascii=False, indent=2, default=str))
+    return 0
+
+
+def scan_blueprint(blueprint_dir: Path) -> Dict[str, Tuple[int, int]]:
+    """{relative path: (mtime_ns, size)} of every markdown file, skipping state/hidden dirs."""
+    stamps: Dict[str, Tuple[int, int]] = {}
+    pending = [blueprint_dir]
+    while pending:
+        current = pending.pop()
+        try:
+            entries = list(os.scandir(current))
+        except FileNotFoundError:
+            continue
+        for entry in entries:
+            if entry.name.startswith("."):
+                continue
+            if entry.is_dir():
+                pending.append(Path(entry.path))
+            elif entry.name.endswith(".md"):
+                st = entry.stat()
+                stamps[Path(entry.path).relative_to(blueprint_dir).as_posix()] = (st.st_mtime_ns, st.st_size)
+    return stamps
+
+
+def watch(
+    session: BlueprintSession,
+    writer: TextIO,
+    interval: float,
+    debounce: float,
+    max_events: int | None = None,
+) -> None:
+    """Poll the blueprint for edits and answer each burst with one JSON line.
+
+    A burst ends once nothing changed for `debounce` seconds. The next poll
+    is diffed against the snapshot the burst was handled from, plus the new
+    stamps of files the session wrote itself: those never re-trigger, while
+    files saved by hand during handling are picked up as the next burst.
+    """
+    stamps = scan_blueprint(session.blueprint_dir)
+    events = 0
+    while max_events is None or events < max_events:
+        time.sleep(interval)
+        current = scan_blueprint(session.blueprint_dir)
+        if current == stamps:
+            continue
+        while True:
+            time.sleep(debounce)
+            settled = scan_blueprint(session.blueprint_dir)
+            if settled == current:
+                break
+            current = settled
+
+        changed = sorted(rel for rel in stamps.keys() | current.keys() if stamps.get(rel) != current.get(rel))
+        start = time.perf_counter()
+        try:
+            resp = session.apply_edits(changed)
+        except Exception as exc:
+            resp = {"status": "error", "changed": changed, "message": f"{type(exc).__name__}: {exc}"}
+        resp["seconds"] = round(time.perf_counter() - start, 4)
+        writer.write(json.dumps(resp, ensure_ascii=False, default=str) + "\n")
+        writer.flush()
+        events += 1
+        stamps = dict(current)
+        for written in resp.get("written_files", []):
+            path = Path(written)
+            rel = path.relative_to(session.blueprint_dir).as_posix()
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                stamps.pop(rel, None)
+                continue
+            stamps[rel] = (st.st_mtime_ns, st.st_size)
+
+
+def main() -> int:
     parser = argparse.ArgumentParser(description="Blueprint day-to-day CLI")
     parser.add_argument(
         "--blueprint-dir",
@@ -79,45 +526,80 @@ def main() -> int:
 
     s_validate = sub.add_parser("validate", help="Validate generated blueprint files")
 
+    s_batch = sub.add_parser("batch", help="Apply a JSON-lines stream of patches in one merge + render pass")
+    s_batch.add_argument("--input", default="-", help="JSON-lines file, or - for stdin (default)")
+    s_batch.add_argument("--on-conflict", choices=["prompt", "keep_old", "use_new"], default="keep_old")
+    s_batch.add_argument("--dry-run", action="store_true")
+
+    s_serve = sub.add_parser("serve", help="Long-lived JSON-lines server keeping the model in memory")
+    s_serve.add_argument("--socket", help="Unix socket path (default: read requests from stdin)")
+
+    s_watch = sub.add_parser("watch", help="Re-validate (and refresh story-derived views) when files change")
+    s_watch.add_argument("--interval", type=float, default=0.5, help="Polling interval in seconds (default: 0.5)")
+    s_watch.add_argument("--debounce", type=float, default=0.3, help="Quiet period that ends a burst of edits (default: 0.3)")
+    s_watch.add_argument("--max-events", type=int, help="Exit after handling this many bursts")
+
+    s_query = sub.add_parser("query", help="Look up stories from the story index without reading story files")
+    s_query.add_argument("--id", help="Story ID, e.g. US-202")
+    s_query.add_argument("--epic")
+    s_query.add_argument("--capability")
+    s_query.add_argument("--milestone")
+    s_query.add_argument("--status", choices=["todo", "doing", "blocked", "done"])
+    s_query.add_argument("--count-by", choices=["epic", "capability", "milestone", "status"], help="Return counts instead of rows")
+
+    sub.add_parser("graph", help="Dependency graph report: topological order, cycles, critical path (JSON)")
+
     args = parser.parse_args()
     blueprint_dir = str(Path(args.blueprint_dir).expanduser().resolve())
 
+    if args.cmd == "graph":
+        from apply_blueprint_merge import build_existing_model, dumps_json
+        from dependency_graph import analyze_dependencies
+
+        report = analyze_dependencies(build_existing_model(Path(blueprint_dir)))
+        print(dumps_json({"status": "ok" if report["acyclic"] else "cycles", **report}))
+        return 0 if report["acyclic"] else 1
+
+    if args.cmd == "query":
+        filters = {k: getattr(args, k) for k in ("id", "epic", "capability", "milestone", "status")}
+        return run_query(Path(blueprint_dir), filters, args.count_by)
+
+    if args.cmd == "watch":
+        try:
+            watch(BlueprintSession(Path(blueprint_dir)), sys.stdout, args.interval, args.debounce, args.max_events)
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    if args.cmd == "serve":
+        session = BlueprintSession(Path(blueprint_dir))
+        if args.socket:
+            serve_socket(session, Path(args.socket).expanduser().resolve())
+        else:
+            serve_stream(session, sys.stdin, sys.stdout)
+        return 0
+
+    if args.cmd == "batch":
+        if args.input == "-":
+            return run_batch(Path(blueprint_dir), sys.stdin, args.on_conflict, args.dry_run)
+        with open(Path(args.input).expanduser(), encoding="utf-8") as f:
+            return run_batch(Path(blueprint_dir), f, args.on_conflict, args.dry_run)
+
     if args.cmd == "validate":
-        return run(["python3", str(validate_script), "--blueprint-dir", blueprint_dir])
+        from validate_blueprint import validate_blueprint_dir, validation_report
+
+        issues = validate_blueprint_dir(Path(blueprint_dir))
+        print(json.dumps(validation_report(issues), ensure_ascii=False, indent=2))
+        return 0 if not issues else 1
 
     if args.cmd in {"story-done", "story-update"}:
         if args.cmd == "story-done":
             payload = {"stories": [{"id": args.id, "status": "done", "progress": 100}]}
             on_conflict = "keep_old"
-            dry_run = args.dry_run
         else:
             payload = build_story_patch(args)
             on_conflict = args.on_conflict
-            dry_run = args.dry_run
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-            json.dump(payload, f, ensure_ascii=False, indent=2)
-            tmp_input = f.name
-
-        cmd = [
-            "python3",
-            str(apply_script),
-            "--input",
-            tmp_input,
-            "--blueprint-dir",
-            blueprint_dir,
-            "--mode",
-            "append",
-            "--on-conflict",
-            on_conflict,
-        ]
-        if dry_run:
-            cmd.append("--dry-run")
-
-        rc = run(cmd)
-        if rc != 0:
-            return rc
-        return run(["python3", str(validate_script), "--blueprint-dir", blueprint_dir])
+        return run_story_patch(Path(blueprint_dir), payload, on_conflict, args.dry_run)
 
     return 1
 
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Graph engine over the Blueprint dependency model.
+
+Nodes are capabilities and externals (plus any id only referenced by an
+edge); an edge `A -> B` means B depends on A, as drawn in Dependencies.md.
+Every pass (topological order, cycle detection, critical path) is linear in
+nodes + edges, so graphs with tens of thousands of edges stay cheap.
+
+Node weight is the remaining effort of the node: the summed `effort`
+(default 1) of its stories that are not done. The critical path is the chain
+with the largest total remaining effort.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Dict, List, Tuple
+
+
+def _dep_id(dep: Any) -> str:
+    if isinstance(dep, dict):
+        return str(dep.get("id", "")).strip()
+    return str(dep).strip()
+
+
+def remaining_effort(stories: List[Dict[str, Any]]) -> Dict[str, float]:
+    """{capability id: summed effort of its stories that are not done}."""
+    effort: Dict[str, float] = {}
+    for story in stories:
+        if not isinstance(story, dict):
+            continue
+        cap_id = str(story.get("capability", "")).strip()
+        if not cap_id:
+            continue
+        remaining = 0.0 if str(story.get("status", "")).lower() == "done" else float(story.get("effort", 1))
+        effort[cap_id] = effort.get(cap_id, 0.0) + remaining
+    return effort
+
+
+class DependencyGraph:
+    """Adjacency-list graph; node ids are interned to integer indexes."""
+
+    def __init__(self) -> None:
+        self.ids: List[str] = []
+        self.titles: List[str] = []
+        self.weights: List[float] = []
+        self.succ: List[List[int]] = []
+        self.index: Dict[str, int] = {}
+        self.edge_count = 0
+        self._edges: set = set()
+
+    def node(self, node_id: str, title: str = "") -> int:
+        i = self.index.get(node_id)
+        if i is None:
+            i = self.index[node_id] = len(self.ids)
+            self.ids.append(node_id)
+            self.titles.append(title)
+            self.weights.append(0.0)
+            self.succ.append([])
+        elif title and not self.titles[i]:
+            self.titles[i] = title
+        return i
+
+    def edge(self, from_id: str, to_id: str) -> None:
+        a, b = self.node(from_id), self.node(to_id)
+        if (a, b) not in self._edges:
+            self._edges.add((a, b))
+            self.succ[a].append(b)
+            self.edge_count += 1
+
+    def topological_order(self) -> Tuple[List[int], List[int]]:
+        """Kahn's algorithm: (ordered nodes, nodes left over because they are on or behind a cycle)."""
+        indegree = [0] * len(self.ids)
+        for targets in self.succ:
+            for b in targets:
+                indegree[b] += 1
+        queue = deque(i for i, d in enumerate(indegree) if d == 0)
+        order: List[int] = []
+        while queue:
+            a = queue.popleft()
+            order.append(a)
+            for b in self.succ[a]:
+                indegree[b] -= 1
+                if indegree[b] == 0:
+                    queue.append(b)
+        return order, [i for i, d in enumerate(indegree) if d > 0]
+
+    def cycles(self, candidates: List[int]) -> List[List[int]]:
+        """Strongly connected components with a cycle among `candidates` (iterative Tarjan)."""
+        allowed = set(candidates)
+        index_of: Dict[int, int] = {}
+        lowlink: Dict[int, int] = {}
+        on_stack: set = set()
+        stack: List[int] = []
+        found: List[List[int]] = []
+
+        for root in candidates:
+            if root in index_of:
+                continue
+            work = [(root, 0)]
+            while work:
+                v, pos = work.pop()
+                if pos == 0:
+                    index_of[v] = lowlink[v] = len(index_of)
+                    stack.append(v)
+                    on_stack.add(v)
+                targets = self.succ[v]
+                while pos < len(targets):
+                    w = targets[pos]
+                    pos += 1
+                    if w not in allowed:
+                        continue
+                    if w not in index_of:
+                        work.append((v, pos))
+                        work.append((w, 0))
+                        break
+                    if w in on_stack:
+                        lowlink[v] = min(lowlink[v], index_of[w])
+                else:
+                    if lowlink[v] == index_of[v]:
+                        component: List[int] = []
+                        while True:
+                            w = stack.pop()
+                            on_stack.discard(w)
+                            component.append(w)
+                            if w == v:
+                                break
+                        if len(component) > 1 or v in self.succ[v]:
+                            found.append(component[::-1])
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[v])
+        return found
+
+    def cycle_through(self, component: List[int]) -> List[int]:
+        """A shortest cycle through component[0] using only edges inside `component` (BFS).
+
+        Each node's successor in the result is an actual edge, and the last
+        node has an edge back to the first.
+        """
+        start = component[0]
+        members = set(component)
+        prev: Dict[int, int] = {}
+        queue = deque([start])
+        while queue:
+            a = queue.popleft()
+            for b in self.succ[a]:
+                if b == start:
+                    path = [a]
+                    while path[-1] != start:
+                        path.append(prev[path[-1]])
+                    return path[::-1]
+                if b in members and b not in prev:
+                    prev[b] = a
+                    queue.append(b)
+        return [start]  # unreachable for a strongly connected component
+
+    def critical_path(self, order: List[int]) -> Tuple[List[int], float]:
+        """Longest weighted chain over the acyclic `order`; ties go to the chain with more nodes."""
+        if not order:
+            return [], 0.0
+        best = {i: (self.weights[i], 1) for i in order}
+        prev: Dict[int, int] = {}
+        for a in order:
+            effort, length = best[a]
+            for b in self.succ[a]:
+                candidate = (effort + self.weights[b], length + 1)
+                if b in best and candidate > best[b]:
+                    best[b] = candidate
+                    prev[b] = a
+        end = max(order, key=best.__getitem__)
+        path = [end]
+        while path[-1] in prev:
+            path.append(prev[path[-1]])
+        return path[::-1], best[end][0]
+
+
+def build_graph(data: Dict[str, Any]) -> DependencyGraph:
+    deps = data.get("dependencies", {})
+    if not isinstance(deps, dict):
+        deps = {}
+    graph = DependencyGraph()
+
+    capabilities = [c for c in deps.get("capabilities", []) or [] if isinstance(c, dict)]
+    for cap in capabilities:
+        graph.node(str(cap.get("id", "C-001")), str(cap.get("title", "")))
+    for ext in deps.get("externals", []) or []:
+        if isinstance(ext, dict):
+            graph.node(str(ext.get("id", "EXT-001")), str(ext.get("title", "")))
+
+    for cap in capabilities:
+        depends_on = cap.get("depends_on", [])
+        if not isinstance(depends_on, list):
+            continue
+        for dep in depends_on:
+            dep_id = _dep_id(dep)
+            if dep_id:
+                graph.edge(dep_id, str(cap.get("id", "C-001")))
+    for edge in deps.get("edges", []) or []:
+        if not isinstance(edge, dict):
+            continue
+        from_id = str(edge.get("from", "")).strip()
+        to_id = str(edge.get("to", "")).strip()
+        if from_id and to_id:
+            graph.edge(from_id, to_id)
+
+    stories = data.get("stories", [])
+    for cap_id, effort in remaining_effort(stories if isinstance(stories, list) else []).items():
+        i = graph.index.get(cap_id)
+        if i is not None:
+            graph.weights[i] = effort
+    return graph
+
+
+def analyze_dependencies(data: Dict[str, Any]) -> Dict[str, Any]:
+    """JSON-ready report: topological order, cycles and the critical path.
+
+    `cycles` holds one real cycle per strongly connected component (each id
+    depends on the one before it, the first on the last); `cyclic_components`
+    lists every member of those components.
+    """
+    graph = build_graph(data)
+    order, leftover = graph.topological_order()
+    path, effort = graph.critical_path(order)
+
+    components = graph.cycles(leftover)
+
+    def describe(i: int) -> Dict[str, Any]:
+        return {"id": graph.ids[i], "title": graph.titles[i], "remaining_effort": graph.weights[i]}
+
+    return {
+        "nodes": len(graph.ids),
+        "edges": graph.edge_count,
+        "acyclic": not leftover,
+        "topological_order": [graph.ids[i] for i in order],
+        "cycles": [[graph.ids[i] for i in graph.cycle_through(component)] for component in components],
+        "cyclic_components": [[graph.ids[i] for i in component] for component in components],
+        # Nodes on a cycle or downstream of one; they have no topological position.
+        "blocked_by_cycles": [graph.ids[i] for i in leftover],
+        "critical_path": {"effort": effort, "nodes": [describe(i) for i in path]},
+    }
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Single-pass tokenizer for the Mermaid flowchart/gantt subset rendered by Blueprint.
+
+`parse_mermaid(block)` walks the block once with precompiled patterns and
+returns nodes, edges and subgraphs (flowchart) or sections with tasks and
+checkpoints (gantt). Shared by apply_blueprint_merge and validate_blueprint.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, List
+
+MERMAID_BLOCK_RE = re.compile(r"```mermaid\n(.*?)```", re.DOTALL)
+
+NODE_RE = re.compile(r'^([A-Za-z0-9_]+)\["([^"]+)"\](?::::([A-Za-z0-9_]+))?\s*$')
+EDGE_RE = re.compile(r'^([A-Za-z0-9_]+)\s+-->(?:\|"([^"]*)"\|)?\s+([A-Za-z0-9_]+)\s*$')
+SUBGRAPH_RE = re.compile(r'^subgraph\s+([A-Za-z0-9_]+)\["([^"]+)"\]\s*$')
+SECTION_RE = re.compile(r"^section\s+(\S+)(?:\s+(.+))?$")
+CHECKPOINT_RE = re.compile(r"^(.+?)\s+:milestone,\s*([A-Za-z0-9_]+),\s*(\d{4}-\d{2}-\d{2}),\s*1d$")
+TASK_RE = re.compile(
+    r"^(.+?)\s+:(?:(active|done|crit),\s*)?([A-Za-z0-9_]+),\s*(\d{4}-\d{2}-\d{2}),\s*(\d{4}-\d{2}-\d{2})$"
+)
+GANTT_DIRECTIVES = ("title ", "dateFormat ", "axisFormat ")
+
+
+def extract_mermaid_blocks(md: str) -> List[str]:
+    return MERMAID_BLOCK_RE.findall(md)
+
+
+def extract_mermaid_block(md: str) -> str:
+    m = MERMAID_BLOCK_RE.search(md)
+    if not m:
+        return ""
+    return m.group(1).strip()
+
+
+def parse_mermaid(block: str) -> Dict[str, Any]:
+    """Tokenize one Mermaid block.
+
+    Flowchart output: `nodes` ({id, label, cls, subgraph}), `edges`
+    ({from, to, label}) and `subgraphs` ({id, title, nodes}). Lines between
+    `subgraph` and `end` attach their nodes to that subgraph.
+
+    Gantt output: `sections` ({id, title, tasks, checkpoints}); tasks are
+    {label, status, ref, start, end} and checkpoints {title, ref, date}.
+    Tasks before the first section land in a section with an empty id.
+    """
+    lines = block.strip().splitlines()
+    header = lines[0].strip() if lines else ""
+    kind = header.split(" ", 1)[0] if header else ""
+    doc: Dict[str, Any] = {
+        "kind": kind,
+        "header": header,
+        "nodes": [],
+        "edges": [],
+        "subgraphs": [],
+        "sections": [],
+    }
+
+    if kind == "gantt":
+        section: Dict[str, Any] | None = None
+        for raw in lines[1:]:
+            line = raw.strip()
+            if not line or line.startswith(GANTT_DIRECTIVES):
+                continue
+            if line.startswith("section"):
+                m = SECTION_RE.match(line)
+                if m:
+                    section = {"id": m.group(1), "title": (m.group(2) or "").strip(), "tasks": [], "checkpoints": []}
+                    doc["sections"].append(section)
+                    continue
+            if ":" not in line:
+                continue
+            if section is None:
+                section = {"id": "", "title": "", "tasks": [], "checkpoints": []}
+                doc["sections"].append(section)
+            m = CHECKPOINT_RE.match(line)
+            if m:
+                section["checkpoints"].append({"title": m.group(1).strip(), "ref": m.group(2), "date": m.group(3)})
+                continue
+            m = TASK_RE.match(line)
+            if m:
+                section["tasks"].append(
+                    {
+                        "label": m.group(1).strip(),
+                        "status": m.group(2) or "",
+                        "ref": m.group(3),
+                        "start": m.group(4),
+                        "end": m.group(5),
+                    }
+                )
+        return doc
+
+    current: Dict[str, Any] | None = None
+    for raw in lines[1:] if kind == "flowchart" else lines:
+        line = raw.strip()
+        if not line:
+            continue
+        if line.startswith("subgraph"):
+            m = SUBGRAPH_RE.match(line)
+            if m:
+                current = {"id": m.group(1), "title": m.group(2), "nodes": []}
+                doc["subgraphs"].append(current)
+                continue
+        if line == "end":
+            current = None
+            continue
+        if "-->" in line:
+            m = EDGE_RE.match(line)
+            if m:
+                doc["edges"].append({"from": m.group(1), "to": m.group(3), "label": (m.group(2) or "").strip()})
+                continue
+        if '["' in line:
+            m = NODE_RE.match(line)
+            if m:
+                node = {
+                    "id": m.group(1),
+                    "label": m.group(2),
+                    "cls": m.group(3) or "",
+                    "subgraph": current["id"] if current is not None else "",
+                }
+                doc["nodes"].append(node)
+                if current is not None:
+                    current["nodes"].append(node)
+    return doc
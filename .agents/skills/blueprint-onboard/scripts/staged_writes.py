@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+All-or-nothing file updates for a blueprint directory.
+
+`commit_files` writes every output into `.blueprint-state/staging`, fsyncs
+the staged files in one pass, records a journal and only then renames the files into place
+(and deletes removed files). A crash before the journal exists leaves the
+blueprint untouched; a crash after it is rolled forward by `recover_staged_writes`
+on the next run, so readers never keep a half-updated set of views. State that
+describes the views (the model snapshot, the story index) is staged through the
+same journal via the `derived` callback.
+
+`blueprint_lock` serializes writers across processes. Every commit, and every
+recovery of someone else's journal, must run while holding it.
+"""
+
+from __future__ import annotations
+
+import errno
+import json
+import os
+import shutil
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from story_loader import STATE_DIR, ensure_state_dir
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+STAGING_DIR = "staging"
+JOURNAL_FILE = "journal.json"
+JOURNAL_VERSION = 1
+LOCK_FILE = "merge.lock"
+LOCK_TIMEOUT = 60.0
+
+# Maps a relative path to the [mtime_ns, size] it has once the commit is applied.
+StampAfter = Callable[[str], Optional[List[int]]]
+
+
+def _try_lock(fd: int) -> bool:
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+def _unlock(fd: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def blueprint_lock(root: Path, timeout: float = LOCK_TIMEOUT) -> Iterator[None]:
+    """Hold the exclusive writer lock (`.blueprint-state/merge.lock`) of a blueprint.
+
+    The lock is an OS file lock, so it is released if the holder crashes. Not
+    reentrant: do not take it again while holding it.
+    """
+    path = root / STATE_DIR / LOCK_FILE
+    ensure_state_dir(path.parent)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        deadline = time.monotonic() + timeout
+        delay = 0.005
+        while not _try_lock(fd):
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"blueprint is locked by another writer: {path}")
+            time.sleep(delay)
+            delay = min(delay * 2, 0.1)
+        try:
+            yield
+        finally:
+            _unlock(fd)
+    finally:
+        os.close(fd)
+
+
+def _fsync_dir(path: Path) -> None:
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        _fsync(fd)
+    except OSError:
+        # Directories cannot be fsynced on every platform (e.g. Windows).
+        pass
+    finally:
+        os.close(fd)
+
+
+def _fsync(fd: int) -> None:
+    # On macOS fsync() leaves data in the drive cache; F_FULLFSYNC flushes it.
+    if fcntl is not None and hasattr(fcntl, "F_FULLFSYNC"):
+        try:
+            fcntl.fcntl(fd, fcntl.F_FULLFSYNC)
+            return
+        except OSError:
+            pass  # not supported by this filesystem
+    os.fsync(fd)
+
+
+def _fsync_file(path: Path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        _fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _replace(src: Path, dst: Path) -> None:
+    try:
+        os.replace(src, dst)
+    except OSError as exc:
+        if exc.errno != errno.EXDEV:
+            raise
+        # Target lives on another filesystem (symlinked folder): copy, then swap there.
+        tmp = dst.with_name(f".{dst.name}.{os.getpid()}.tmp")
+        shutil.copy2(src, tmp)
+        _fsync_file(tmp)
+        os.replace(tmp, dst)
+        src.unlink()
+
+
+def _apply_journal(root: Path, journal: Dict[str, object]) -> None:
+    staging = root / STATE_DIR / STAGING_DIR
+    touched: set = set()
+    writes = journal.get("writes", {})
+    for name, rel in (writes.items() if isinstance(writes, dict) else []):
+        src = staging / name
+        if not src.exists():
+            continue  # already moved before an interruption
+        dst = root / rel
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        _replace(src, dst)
+        touched.add(dst.parent)
+    removals = journal.get("removals", [])
+    for rel in (removals if isinstance(removals, list) else []):
+        dst = root / rel
+        dst.unlink(missing_ok=True)
+        touched.add(dst.parent)
+    for directory in touched:
+        _fsync_dir(directory)
+
+
+def _clear(root: Path) -> None:
+    state = root / STATE_DIR
+    (state / JOURNAL_FILE).unlink(missing_ok=True)
+    shutil.rmtree(state / STAGING_DIR, ignore_errors=True)
+
+
+def recover_staged_writes(root: Path) -> bool:
+    """Finish (or discard) a commit interrupted by a crash. Returns True if one was found.
+
+    Call with `blueprint_lock` held, or a live writer's journal could be replayed.
+    """
+    state = root / STATE_DIR
+    journal_path = state / JOURNAL_FILE
+    if journal_path.exists():
+        try:
+            journal = json.loads(journal_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            journal = None
+        if isinstance(journal, dict) and journal.get("version") == JOURNAL_VERSION:
+            _apply_journal(root, journal)
+        _clear(root)
+        return True
+    if (state / STAGING_DIR).exists():
+        # Crashed while staging: nothing was swapped in yet.
+        _clear(root)
+        return True
+    return False
+
+
+def commit_files(
+    root: Path,
+    writes: Dict[str, str],
+    removals: Iterable[str] = (),
+    derived: Callable[[StampAfter], Dict[str, str]] | None = None,
+) -> None:
+    """Write `writes` ({relative path: text}) and delete `removals` as one unit.
+
+    `derived` is called once `writes` are staged, with a StampAfter for the
+    committed tree (renames keep mtime and size); the files it returns are
+    committed in the same unit. The caller holds `blueprint_lock`.
+    """
+    removals = list(removals)
+    if not writes and not removals and derived is None:
+        return
+    state = root / STATE_DIR
+    staging = state / STAGING_DIR
+    recover_staged_writes(root)
+    ensure_state_dir(state)
+    staging.mkdir(parents=True, exist_ok=True)
+
+    names: Dict[str, str] = {}
+    staged: Dict[str, Path] = {}
+
+    def stage(files: Dict[str, str]) -> None:
+        for rel, text in files.items():
+            name = f"{len(names):06d}"
+            path = staging / name
+            path.write_text(text, encoding="utf-8")
+            names[name] = rel
+            staged[rel] = path
+
+    def stamp_after(rel: str) -> List[int] | None:
+        if rel in removed:
+            return None
+        try:
+            st = (staged.get(rel) or root / rel).stat()
+        except FileNotFoundError:
+            return None
+        return [st.st_mtime_ns, st.st_size]
+
+    removed = set(removals)
+    stage(writes)
+    if derived is not None:
+        stage(derived(stamp_after))
+    # Every file is written first, then fsynced in one pass before the journal:
+    # the journal must never point at contents that are not on disk yet.
+    for path in staged.values():
+        _fsync_file(path)
+    _fsync_dir(staging)
+
+    journal = {"version": JOURNAL_VERSION, "writes": names, "removals": removals}
+    tmp = state / f"{JOURNAL_FILE}.tmp"
+    tmp.write_text(json.dumps(journal, ensure_ascii=False), encoding="utf-8")
+    _fsync_file(tmp)
+    os.replace(tmp, state / JOURNAL_FILE)
+    _fsync_dir(state)
+
+    _apply_journal(root, journal)
+    _clear(root)
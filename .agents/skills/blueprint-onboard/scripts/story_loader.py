@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Shared loader for `Stories/US-*.md` frontmatter.
+
+Files are read on a thread pool and parsed frontmatter is cached on disk,
+keyed by file name plus (mtime, size), so repeated merge/validate runs only
+parse stories that changed since the previous run.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from yaml_loader import safe_load
+
+STATE_DIR = ".blueprint-state"
+CACHE_FILE = "frontmatter-cache.json"
+CACHE_VERSION = 1
+STORY_TEMPLATE_NAME = "US-xxx.md"
+
+AUTO_RE = re.compile(r"<!-- AUTO:START -->\n?(.*?)\n?<!-- AUTO:END -->", re.DOTALL)
+FRONTMATTER_RE = re.compile(r"^---\n(.*?)\n---\n", re.DOTALL)
+
+# (frontmatter, unparsed_block): `unparsed_block` is set when a frontmatter
+# block exists but YAML could not parse it, so callers may apply a fallback.
+Parsed = Tuple[Dict[str, Any] | None, str | None]
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, (dt.date, dt.datetime)):
+        return value.isoformat()
+    if isinstance(value, list):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    return value
+
+
+def extract_auto_content(text: str) -> str:
+    m = AUTO_RE.search(text)
+    if m:
+        return m.group(1).strip()
+    return text.strip()
+
+
+# Keys written by render_blueprint.story_frontmatter; only these take the fast path.
+FAST_STRING_KEYS = frozenset(
+    {"id", "epic", "capability", "milestone", "title", "status", "openspec_change", "vibe_parent_task"}
+)
+FAST_INT_KEYS = frozenset({"progress", "effort"})
+FAST_LIST_KEYS = frozenset({"vibe_tasks"})
+FAST_INT_RE = re.compile(r"0|-?[1-9][0-9]*")
+FAST_ITEM_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_./-]*")
+# First characters that are YAML indicators or may start a number/timestamp/special float.
+FAST_UNSAFE_START = frozenset("-?:,[]{}#&*!|>'\"%@`+.~0123456789 \t")
+# Plain scalars that YAML resolves to bool/null (or merge/value keys) rather than str.
+FAST_RESERVED = frozenset(
+    "yes Yes YES no No NO true True TRUE false False FALSE on On ON off Off OFF null Null NULL = <<".split()
+)
+
+
+def _fast_str(value: str) -> bool:
+    return (
+        bool(value)
+        and value[0] not in FAST_UNSAFE_START
+        and value not in FAST_RESERVED
+        and value.isprintable()
+        and value == value.rstrip()
+        and not value.endswith(":")
+        and ": " not in value
+        and " #" not in value
+    )
+
+
+def fast_frontmatter(block: str) -> Dict[str, Any] | None:
+    """Parse the flat story frontmatter schema without YAML.
+
+    Returns None for anything outside the plain subset this reader is sure
+    YAML would parse identically (unknown or repeated keys, quoting,
+    comments, values YAML would resolve to non-strings, ...); callers then
+    fall back to the full YAML parser.
+    """
+    data: Dict[str, Any] = {}
+    for line in block.split("\n"):
+        key, sep, value = line.partition(": ")
+        if not sep or key in data:
+            return None
+        if key in FAST_STRING_KEYS:
+            if not _fast_str(value):
+                return None
+            data[key] = value
+        elif key in FAST_INT_KEYS:
+            if not FAST_INT_RE.fullmatch(value):
+                return None
+            data[key] = int(value)
+        elif key in FAST_LIST_KEYS:
+            if not (value.startswith("[") and value.endswith("]")):
+                return None
+            inner = value[1:-1]
+            items = inner.split(", ") if inner else []
+            if not all(FAST_ITEM_RE.fullmatch(item) and item not in FAST_RESERVED for item in items):
+                return None
+            data[key] = items
+        else:
+            return None
+    return data
+
+
+def parse_frontmatter(md: str) -> Parsed:
+    m = FRONTMATTER_RE.match(md)
+    if not m:
+        return None, None
+    fast = fast_frontmatter(m.group(1))
+    if fast is not None:
+        return fast, None
+    try:
+        data = safe_load(m.group(1))
+    except Exception:
+        return None, m.group(1)
+    return (_jsonable(data), None) if isinstance(data, dict) else (None, None)
+
+
+def parse_story_file(path: Path) -> Parsed:
+    return parse_frontmatter(extract_auto_content(path.read_text(encoding="utf-8")))
+
+
+def ensure_state_dir(state: Path) -> None:
+    """Create the `.blueprint-state` directory `state`, ignored by git.
+
+    It only holds caches, locks and staged writes, so it carries a `.gitignore`
+    matching everything, itself included.
+    """
+    state.mkdir(parents=True, exist_ok=True)
+    ignore = state / ".gitignore"
+    if not ignore.exists():
+        ignore.write_text("# Blueprint script caches, locks and staged writes.\n*\n", encoding="utf-8")
+
+
+def cache_path_for(stories_dir: Path) -> Path:
+    return stories_dir.parent / STATE_DIR / CACHE_FILE
+
+
+def _read_cache(path: Path) -> Dict[str, Any]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+        return {}
+    entries = data.get("entries")
+    return entries if isinstance(entries, dict) else {}
+
+
+def _write_cache(path: Path, entries: Dict[str, Any]) -> None:
+    try:
+        ensure_state_dir(path.parent)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(
+            json.dumps({"version": CACHE_VERSION, "entries": entries}, ensure_ascii=False),
+            encoding="utf-8",
+        )
+        os.replace(tmp, path)
+    except OSError:
+        # The cache is an optimisation only; a read-only blueprint still loads.
+        pass
+
+
+def scan_story_stamps(stories_dir: Path) -> Dict[str, List[int]]:
+    """{file name: [mtime_ns, size]} of every `US-*.md` except the `US-xxx.md` template."""
+    stamps: Dict[str, List[int]] = {}
+    if not stories_dir.exists():
+        return stamps
+    with os.scandir(stories_dir) as it:
+        for entry in it:
+            name = entry.name
+            if not (name.startswith("US-") and name.endswith(".md")) or name == STORY_TEMPLATE_NAME:
+                continue
+            if not entry.is_file():
+                continue
+            st = entry.stat()
+            stamps[name] = [st.st_mtime_ns, st.st_size]
+    return stamps
+
+
+def load_story_frontmatters(
+    stories_dir: Path,
+    *,
+    use_cache: bool = True,
+    workers: int | None = None,
+) -> List[Tuple[Path, Parsed]]:
+    """Parse the frontmatter of every `US-*.md` (except the `US-xxx.md` template), sorted by name."""
+    if not stories_dir.exists():
+        return []
+
+    stamps = scan_story_stamps(stories_dir)
+    cache_path = cache_path_for(stories_dir)
+    cached = _read_cache(cache_path) if use_cache else {}
+
+    results: Dict[str, Parsed] = {}
+    pending: List[str] = []
+    for name, stamp in stamps.items():
+        hit = cached.get(name)
+        if isinstance(hit, dict) and hit.get("stamp") == stamp:
+            results[name] = (hit.get("data"), hit.get("unparsed"))
+        else:
+            pending.append(name)
+
+    if len(pending) == 1:
+        # Typical after a single-story update: no pool needed.
+        results[pending[0]] = parse_story_file(stories_dir / pending[0])
+    elif pending:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            parsed = pool.map(lambda n: parse_story_file(stories_dir / n), pending)
+            for name, value in zip(pending, parsed):
+                results[name] = value
+
+    if use_cache and (pending or len(cached) != len(stamps)):
+        _write_cache(
+            cache_path,
+            {
+                name: {"stamp": stamps[name], "data": results[name][0], "unparsed": results[name][1]}
+                for name in sorted(results)
+            },
+        )
+
+    return [(stories_dir / name, results[name]) for name in sorted(results)]
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Property test: fast_frontmatter must agree with the YAML loader.
+
+Generates story frontmatter blocks (rendered, then hand-edit style mutations
+with values on the edges of the fast subset) and fails on any block where
+fast_frontmatter returns a result that differs from yaml_loader.safe_load.
+
+Usage:
+  python3 test_story_loader.py [-v]
+  FRONTMATTER_CASES=200000 python3 test_story_loader.py
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import sys
+import unittest
+from pathlib import Path
+from typing import Any, Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from render_blueprint import story_frontmatter  # noqa: E402
+from story_loader import _jsonable, fast_frontmatter  # noqa: E402
+from yaml_loader import safe_load  # noqa: E402
+
+CASES = int(os.environ.get("FRONTMATTER_CASES", "20000"))
+SEED = int(os.environ.get("FRONTMATTER_SEED", "7"))
+
+
+# Values that sit on the edges of the fast frontmatter subset.
+TRICKY_VALUES = [
+    "", " ", "US-001", "示例 Story", "yes", "No", "null", "~", "true", "on", "0", "007", "-1", "1e3", "0x1F",
+    ".inf", "2026-01-01", "12:30", "a: b", "a:b", "a #b", "a#b", "ends:", "[x]", "{y}", "'q'", '"dq"', "it's",
+    "- item", "? key", "!tag", "&anchor", "*alias", "|", ">", "%dir", "@at", "`tick`", "=", "<<", "<目标用户>",
+    "tab\there", "trail ", "C-001 / auth", "100%", "a, b", "x\u2028y", "\ufeffbom", "NaN", "_private",
+]
+
+
+def random_value(rng: random.Random) -> Any:
+    roll = rng.random()
+    if roll < 0.4:
+        return rng.choice(TRICKY_VALUES)
+    if roll < 0.5:
+        return rng.randint(-5, 150)
+    alphabet = "abcXYZ019 -_:#,[]{}'\"!&*|>%@`.~/故事\t"
+    return "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 12)))
+
+
+def random_frontmatter_block(rng: random.Random) -> str:
+    story: Dict[str, Any] = {}
+    for key in ["id", "epic", "capability", "milestone", "title", "status", "openspec_change", "vibe_parent_task"]:
+        if rng.random() < 0.95:
+            story[key] = random_value(rng) if rng.random() < 0.1 else f"{key[:3].upper()}-{rng.randint(1, 999):03d}"
+    for key in ["progress", "effort"]:
+        story[key] = rng.choice([0, 1, 5, 100, -3, "7", "1.5"]) if rng.random() < 0.1 else rng.randint(0, 100)
+    story["vibe_tasks"] = [random_value(rng) if rng.random() < 0.1 else f"t-{i}" for i in range(rng.randint(0, 3))]
+    try:
+        lines = story_frontmatter(story).split("\n")[1:-2]
+    except (TypeError, ValueError):
+        lines = [f"id: {story.get('id', 'US-001')}"]
+
+    # Hand-edit style mutations.
+    mutation = rng.random()
+    if mutation < 0.05 and lines:
+        lines.append(rng.choice(lines))
+    elif mutation < 0.1:
+        lines.insert(rng.randint(0, len(lines)), "# comment")
+    elif mutation < 0.15 and lines:
+        del lines[rng.randrange(len(lines))]
+    elif mutation < 0.2:
+        lines.append(f"extra: {random_value(rng)}")
+    elif mutation < 0.25 and lines:
+        i = rng.randrange(len(lines))
+        lines[i] = lines[i].replace(": ", ":  ", 1)
+    return "\n".join(lines)
+
+
+def yaml_frontmatter(block: str) -> Any:
+    try:
+        return _jsonable(safe_load(block))
+    except Exception as exc:
+        return f"yaml error: {exc}"
+
+
+class FastFrontmatterTest(unittest.TestCase):
+    def assert_matches_yaml(self, block: str) -> bool:
+        fast = fast_frontmatter(block)
+        if fast is None:
+            return False
+        self.assertEqual(fast, yaml_frontmatter(block), f"fast_frontmatter disagrees with YAML on:\n{block}")
+        return True
+
+    def test_rendered_frontmatter_takes_fast_path(self) -> None:
+        story = {"id": "US-001", "capability": "C-001", "milestone": "M-001", "title": "Login", "progress": 40}
+        block = story_frontmatter(story).split("\n", 1)[1].rsplit("---", 1)[0].rstrip("\n")
+        self.assertTrue(self.assert_matches_yaml(block))
+
+    def test_tricky_values(self) -> None:
+        for value in TRICKY_VALUES:
+            self.assert_matches_yaml(f"id: US-001\ntitle: {value}")
+
+    def test_random_blocks(self) -> None:
+        rng = random.Random(SEED)
+        fast_hits = 0
+        for _ in range(CASES):
+            fast_hits += self.assert_matches_yaml(random_frontmatter_block(rng))
+        # Guard against the generator drifting to blocks the fast path always declines.
+        self.assertGreater(fast_hits, CASES // 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
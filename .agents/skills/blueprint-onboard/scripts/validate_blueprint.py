@@ -4,157 +4,172 @@ Validate Blueprint V3 files.
 
 Usage:
   python3 validate_blueprint.py --blueprint-dir /path/to/blueprint
+  python3 validate_blueprint.py --blueprint-dirs services/a/blueprint services/b/blueprint
+  python3 validate_blueprint.py --glob "services/*/blueprint" [--workers 8]
 """
 
 from __future__ import annotations
 
 import argparse
+import glob
 import json
 import re
+import time
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Callable, Dict, List, Tuple
 
+from mermaid_parser import extract_mermaid_blocks, parse_mermaid
+from story_loader import Parsed, extract_auto_content, load_story_frontmatters, parse_frontmatter
 
-def extract_auto_content(text: str) -> str:
-    m = re.search(
-        re.escape("<!-- AUTO:START -->")
-        + r"\n?(.*?)\n?"
-        + re.escape("<!-- AUTO:END -->"),
-        text,
-        re.DOTALL,
-    )
-    if m:
-        return m.group(1).strip()
-    return text.strip()
+# Label rules search the raw AUTO text, so node definitions anywhere (including
+# inline in edge lines) count, not only the ones the tokenizer extracts.
+EPIC_LABEL_RE = re.compile(r'\["E-\d+\s+[^"\]]+')
+CAPABILITY_LABEL_RE = re.compile(r'\["C-\d+\s+[^"\]]+')
+ANY_LABEL_RE = re.compile(r'\["[^"\]]+"\]')
 
+Issues = List[Dict[str, Any]]
 
-def extract_mermaid_blocks(md: str) -> List[str]:
-    return re.findall(r"```mermaid\n(.*?)```", md, re.DOTALL)
+
+def parse_frontmatter_lines(block: str) -> Dict[str, Any]:
+    data: Dict[str, Any] = {}
+    for raw_line in block.splitlines():
+        line = raw_line.strip()
+        if not line or line.startswith('#') or ':' not in line:
+            continue
+        key, value = line.split(':', 1)
+        key = key.strip()
+        value = value.strip()
+        if not key:
+            continue
+        if value.startswith('[') and value.endswith(']'):
+            inner = value[1:-1].strip()
+            data[key] = [part.strip() for part in inner.split(',') if part.strip()] if inner else []
+            continue
+        if value.isdigit():
+            data[key] = int(value)
+            continue
+        data[key] = value
+    return data
+
+
+def resolve_frontmatter(parsed: Parsed) -> Dict[str, Any] | None:
+    data, unparsed = parsed
+    if data is None and unparsed is not None:
+        return parse_frontmatter_lines(unparsed)
+    return data
 
 
 def parse_story_frontmatter(md: str) -> Dict[str, Any] | None:
-    m = re.match(r"^---\n(.*?)\n---\n", md, re.DOTALL)
-    if not m:
-        return None
-    try:
-        import yaml  # type: ignore
-        data = yaml.safe_load(m.group(1))
-    except Exception:
-        data = {}
-        for raw_line in m.group(1).splitlines():
-            line = raw_line.strip()
-            if not line or line.startswith('#') or ':' not in line:
-                continue
-            key, value = line.split(':', 1)
-            key = key.strip()
-            value = value.strip()
-            if not key:
-                continue
-            if value.startswith('[') and value.endswith(']'):
-                inner = value[1:-1].strip()
-                data[key] = [part.strip() for part in inner.split(',') if part.strip()] if inner else []
-                continue
-            if value.isdigit():
-                data[key] = int(value)
-                continue
-            data[key] = value
-    return data if isinstance(data, dict) else None
-
-
-def add_issue(issues: List[Dict[str, Any]], file: Path, rule: str, message: str) -> None:
+    return resolve_frontmatter(parse_frontmatter(md))
+
+
+class BlueprintDocs:
+    """Shared document cache for one validation run.
+
+    Each file is read, AUTO-extracted and Mermaid-parsed at most once.
+    `contents` ({relative path: content}, e.g. the merge tool's rendered
+    output) is used instead of reading those files from disk.
+    """
+
+    def __init__(self, root: Path, contents: Dict[str, str] | None = None) -> None:
+        self.root = root
+        self.contents = dict(contents or {})
+        self._auto: Dict[str, str | None] = {}
+        self._mermaid: Dict[str, Dict[str, Any] | None] = {}
+
+    def path(self, rel: str) -> Path:
+        return self.root / rel
+
+    def auto(self, rel: str) -> str | None:
+        """AUTO content of `rel`, or None when the file does not exist."""
+        if rel not in self._auto:
+            if rel in self.contents:
+                self._auto[rel] = extract_auto_content(self.contents[rel])
+            else:
+                try:
+                    text = self.path(rel).read_text(encoding="utf-8")
+                except FileNotFoundError:
+                    text = None
+                self._auto[rel] = extract_auto_content(text) if text is not None else None
+        return self._auto[rel]
+
+    def mermaid(self, rel: str) -> Dict[str, Any] | None:
+        """First Mermaid block of `rel` parsed, or None when there is none."""
+        if rel not in self._mermaid:
+            blocks = extract_mermaid_blocks(self.auto(rel) or "")
+            self._mermaid[rel] = parse_mermaid(blocks[0]) if blocks else None
+        return self._mermaid[rel]
+
+    def invalidate(self, rels: List[str]) -> None:
+        """Forget cached parses of `rels` (e.g. files edited since the last run)."""
+        for rel in rels:
+            self.contents.pop(rel, None)
+            self._auto.pop(rel, None)
+            self._mermaid.pop(rel, None)
+
+
+def add_issue(issues: Issues, file: Path, rule: str, message: str) -> None:
     issues.append({"file": str(file), "rule": rule, "message": message})
 
 
-def validate_roadmap_tree(file: Path, issues: List[Dict[str, Any]]) -> None:
-    if not file.exists():
-        add_issue(issues, file, "exists", "missing file")
-        return
-    auto = extract_auto_content(file.read_text(encoding="utf-8"))
-    blocks = extract_mermaid_blocks(auto)
-    if not blocks:
-        add_issue(issues, file, "mermaid", "missing mermaid block")
-        return
-    first = blocks[0].strip().splitlines()[0].strip() if blocks[0].strip() else ""
+def check_roadmap_tree(doc: Dict[str, Any], auto: str, file: Path, issues: Issues) -> None:
+    first = doc["header"]
     if first not in {"flowchart TB", "flowchart LR"}:
         add_issue(issues, file, "mermaid_type", f"expected flowchart TB or flowchart LR, got: {first}")
 
-    if not re.search(r'\["E-\d+\s+[^"\]]+', auto):
+    if not EPIC_LABEL_RE.search(auto):
         add_issue(issues, file, "node_label", "missing 'ID + 名称摘要' epic labels")
 
 
-def validate_dependencies(file: Path, issues: List[Dict[str, Any]]) -> None:
-    if not file.exists():
-        add_issue(issues, file, "exists", "missing file")
-        return
-    auto = extract_auto_content(file.read_text(encoding="utf-8"))
-    blocks = extract_mermaid_blocks(auto)
-    if not blocks:
-        add_issue(issues, file, "mermaid", "missing mermaid block")
-        return
-    first = blocks[0].strip().splitlines()[0].strip() if blocks[0].strip() else ""
+def check_dependencies(doc: Dict[str, Any], auto: str, file: Path, issues: Issues) -> None:
+    first = doc["header"]
     if first != "flowchart LR":
         add_issue(issues, file, "mermaid_type", f"expected flowchart LR, got: {first}")
-    has_any_nodes = bool(re.search(r'\["[^"\]]+"\]', auto))
-    has_capability_labels = bool(re.search(r'\["C-\d+\s+[^"\]]+', auto))
+    has_any_nodes = bool(ANY_LABEL_RE.search(auto))
+    has_capability_labels = bool(CAPABILITY_LABEL_RE.search(auto))
     if has_any_nodes and not has_capability_labels:
         add_issue(issues, file, "node_label", "missing 'ID + 名称摘要' capability labels")
 
 
-def validate_milestones(file: Path, issues: List[Dict[str, Any]]) -> None:
-    if not file.exists():
-        add_issue(issues, file, "exists", "missing file")
-        return
-    auto = extract_auto_content(file.read_text(encoding="utf-8"))
-    blocks = extract_mermaid_blocks(auto)
-    if not blocks:
-        add_issue(issues, file, "mermaid", "missing mermaid block")
-        return
-    first = blocks[0].strip().splitlines()[0].strip() if blocks[0].strip() else ""
+def check_milestones(doc: Dict[str, Any], auto: str, file: Path, issues: Issues) -> None:
+    first = doc["header"]
     if first != "gantt":
         add_issue(issues, file, "mermaid_type", f"expected gantt, got: {first}")
 
 
-def validate_arch_a(file: Path, issues: List[Dict[str, Any]]) -> None:
-    if not file.exists():
-        add_issue(issues, file, "exists", "missing file")
-        return
-    auto = extract_auto_content(file.read_text(encoding="utf-8"))
-    blocks = extract_mermaid_blocks(auto)
-    if not blocks:
-        add_issue(issues, file, "mermaid", "missing mermaid block")
-        return
-    block = blocks[0]
-    if not block.strip().startswith("flowchart"):
+def check_arch_a(doc: Dict[str, Any], auto: str, file: Path, issues: Issues) -> None:
+    if not doc["header"].startswith("flowchart"):
         add_issue(issues, file, "mermaid_type", "expected flowchart in architecture A")
-    if "subgraph" not in block:
+    # Any subgraph form counts (`subgraph Frontend`, `subgraph L1["..."]`), as before.
+    if "subgraph" not in extract_mermaid_blocks(auto)[0]:
         add_issue(issues, file, "subgraph", "architecture A should contain subgraph")
 
 
-def validate_arch_b(file: Path, issues: List[Dict[str, Any]]) -> None:
-    if not file.exists():
-        add_issue(issues, file, "exists", "missing file")
-        return
-    auto = extract_auto_content(file.read_text(encoding="utf-8"))
-    blocks = extract_mermaid_blocks(auto)
-    if not blocks:
-        add_issue(issues, file, "mermaid", "missing mermaid block")
-        return
-    first = blocks[0].strip().splitlines()[0].strip() if blocks[0].strip() else ""
+def check_arch_b(doc: Dict[str, Any], auto: str, file: Path, issues: Issues) -> None:
+    first = doc["header"]
     if first != "flowchart LR":
         add_issue(issues, file, "mermaid_type", f"expected flowchart LR, got: {first}")
 
 
-def validate_stories(stories_dir: Path, issues: List[Dict[str, Any]]) -> None:
+# Mermaid view rules, run in order. The engine reports missing files and
+# missing Mermaid blocks itself, so each check sees the parsed first block
+# plus the AUTO text it came from.
+VIEW_RULES: List[Tuple[str, Callable[[Dict[str, Any], str, Path, Issues], None]]] = [
+    ("Roadmap/Blueprint Tree.md", check_roadmap_tree),
+    ("Roadmap/Dependencies.md", check_dependencies),
+    ("Roadmap/Milestones.md", check_milestones),
+    ("Architecture/Architecture A - Layers.md", check_arch_a),
+    ("Architecture/Architecture B - Containers.md", check_arch_b),
+]
+
+
+def validate_stories(stories_dir: Path, issues: Issues) -> None:
     if not stories_dir.exists():
         add_issue(issues, stories_dir, "exists", "missing Stories dir")
         return
 
-    for p in sorted(stories_dir.glob("US-*.md")):
-        if p.name == "US-xxx.md":
-            continue
-        raw = p.read_text(encoding="utf-8")
-        auto = extract_auto_content(raw)
-        fm = parse_story_frontmatter(auto)
+    for p, parsed in load_story_frontmatters(stories_dir):
+        fm = resolve_frontmatter(parsed)
         if fm is None:
             add_issue(issues, p, "frontmatter", "missing or invalid frontmatter")
             continue
@@ -168,25 +183,117 @@ def validate_stories(stories_dir: Path, issues: List[Dict[str, Any]]) -> None:
             add_issue(issues, p, "id_filename", f"frontmatter id ({story_id}) != filename ({file_id})")
 
 
+def validate_docs(docs: BlueprintDocs) -> Issues:
+    """Run every rule over the documents of one blueprint."""
+    issues: Issues = []
+
+    for rel, check in VIEW_RULES:
+        file = docs.path(rel)
+        auto = docs.auto(rel)
+        if auto is None:
+            add_issue(issues, file, "exists", "missing file")
+            continue
+        doc = docs.mermaid(rel)
+        if doc is None:
+            add_issue(issues, file, "mermaid", "missing mermaid block")
+            continue
+        check(doc, auto, file, issues)
+
+    validate_stories(docs.path("Stories"), issues)
+    return issues
+
+
+def validate_blueprint_dir(root: Path, contents: Dict[str, str] | None = None) -> Issues:
+    """Validate `root`; `contents` seeds the document cache (see BlueprintDocs)."""
+    return validate_docs(BlueprintDocs(root, contents))
+
+
+def validation_report(issues: Issues) -> Dict[str, Any]:
+    return {"status": "ok" if not issues else "failed", "issues": issues}
+
+
+def root_error(root: str, exc: BaseException, seconds: float) -> Dict[str, Any]:
+    return {
+        "blueprint_dir": root,
+        "status": "error",
+        "message": f"{type(exc).__name__}: {exc}",
+        "issues": [],
+        "seconds": round(seconds, 4),
+    }
+
+
+def validate_one(root: str) -> Dict[str, Any]:
+    """Validation report of one root; a root that cannot be validated reports status "error"."""
+    start = time.perf_counter()
+    try:
+        issues = validate_blueprint_dir(Path(root))
+    except Exception as exc:
+        return root_error(root, exc, time.perf_counter() - start)
+    report = validation_report(issues)
+    return {"blueprint_dir": root, **report, "seconds": round(time.perf_counter() - start, 4)}
+
+
+def expand_blueprint_dirs(dirs: List[str], pattern: str | None) -> List[str]:
+    # Explicitly listed directories are kept even when missing, so they are reported.
+    roots = {str(Path(d).expanduser().resolve()) for d in dirs}
+    if pattern:
+        for match in glob.glob(str(Path(pattern).expanduser()), recursive=True):
+            if Path(match).is_dir():
+                roots.add(str(Path(match).resolve()))
+    return sorted(roots)
+
+
+def validate_many(roots: List[str], workers: int | None = None) -> Dict[str, Any]:
+    """Validate several blueprint roots in a process pool and aggregate the results.
+
+    Each root is reported on its own: one that raises, or whose worker dies,
+    gets status "error" and does not affect the others.
+    """
+    start = time.perf_counter()
+    if len(roots) <= 1 or workers == 1:
+        results = [validate_one(r) for r in roots]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        results = []
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(validate_one, r) for r in roots]
+            for root, future in zip(roots, futures):
+                try:
+                    results.append(future.result())
+                except Exception as exc:
+                    results.append(root_error(root, exc, time.perf_counter() - start))
+    failed = [r["blueprint_dir"] for r in results if r["status"] != "ok"]
+    return {
+        "status": "ok" if not failed else "failed",
+        "total": len(results),
+        "failed": failed,
+        "seconds": round(time.perf_counter() - start, 4),
+        "blueprints": results,
+    }
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Validate Blueprint V3 markdown structure")
-    parser.add_argument("--blueprint-dir", required=True, help="Path to blueprint directory")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--blueprint-dir", help="Path to blueprint directory")
+    target.add_argument("--blueprint-dirs", nargs="+", help="Several blueprint directories (aggregated report)")
+    target.add_argument("--glob", help="Glob for blueprint directories, e.g. 'services/*/blueprint' (aggregated report)")
+    parser.add_argument("--workers", type=int, help="Worker processes for --blueprint-dirs/--glob (default: CPU count)")
     args = parser.parse_args()
 
+    if args.blueprint_dir is None:
+        roots = expand_blueprint_dirs(args.blueprint_dirs or [], args.glob)
+        if not roots:
+            parser.error(f"no blueprint directories match: {args.glob}")
+        out = validate_many(roots, args.workers)
+        print(json.dumps(out, ensure_ascii=False, indent=2))
+        raise SystemExit(0 if out["status"] == "ok" else 1)
+
     root = Path(args.blueprint_dir).expanduser().resolve()
-    issues: List[Dict[str, Any]] = []
-
-    validate_roadmap_tree(root / "Roadmap/Blueprint Tree.md", issues)
-    validate_dependencies(root / "Roadmap/Dependencies.md", issues)
-    validate_milestones(root / "Roadmap/Milestones.md", issues)
-    validate_arch_a(root / "Architecture/Architecture A - Layers.md", issues)
-    validate_arch_b(root / "Architecture/Architecture B - Containers.md", issues)
-    validate_stories(root / "Stories", issues)
-
-    out = {
-        "status": "ok" if not issues else "failed",
-        "issues": issues,
-    }
+    issues = validate_blueprint_dir(root)
+
+    out = validation_report(issues)
     print(json.dumps(out, ensure_ascii=False, indent=2))
     raise SystemExit(0 if not issues else 1)
 
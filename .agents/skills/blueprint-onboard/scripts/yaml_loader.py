@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Lazily initialised YAML loading shared by the Blueprint scripts.
+
+PyYAML is imported on first use only, so commands that never read YAML do
+not pay for it. The libyaml-backed `CSafeLoader` is used when PyYAML was
+built with it, falling back to the pure-Python `SafeLoader`.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+_yaml: Any = None
+_loader: Any = None
+
+
+def safe_load(text: str) -> Any:
+    """`yaml.safe_load` equivalent; raises ImportError when PyYAML is missing."""
+    global _yaml, _loader
+    if _yaml is None:
+        import yaml  # type: ignore
+
+        _loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        _yaml = yaml
+    return _yaml.load(text, Loader=_loader)
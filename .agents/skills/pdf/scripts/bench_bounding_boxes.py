@@ -0,0 +1,132 @@
+"""
+Benchmark check_bounding_boxes on synthetic forms.
+
+Times the page-bucketed sweep against the original all-pairs scan and checks
+that both produce the same messages, on two layouts: two columns with 60
+fields per page, and one long single column on one page (every rect shares
+an x-span, the worst case for an x-only sweep).
+
+Usage: python bench_bounding_boxes.py [--sizes 100,1000,10000,50000] [--legacy-max 2000]
+"""
+
+import argparse
+import io
+import json
+import random
+import time
+
+from check_bounding_boxes import RectAndField, get_bounding_box_messages, rects_intersect
+
+
+def legacy_bounding_box_messages(fields_json_stream) -> list[str]:
+    """The original O(n^2) check, kept as the reference implementation."""
+    messages = []
+    fields = json.load(fields_json_stream)
+    messages.append(f"Read {len(fields['form_fields'])} fields")
+
+    rects_and_fields = []
+    for f in fields["form_fields"]:
+        rects_and_fields.append(RectAndField(f["label_bounding_box"], "label", f))
+        rects_and_fields.append(RectAndField(f["entry_bounding_box"], "entry", f))
+
+    has_error = False
+    for i, ri in enumerate(rects_and_fields):
+        for j in range(i + 1, len(rects_and_fields)):
+            rj = rects_and_fields[j]
+            if ri.field["page_number"] == rj.field["page_number"] and rects_intersect(ri.rect, rj.rect):
+                has_error = True
+                if ri.field is rj.field:
+                    messages.append(f"FAILURE: intersection between label and entry bounding boxes for `{ri.field['description']}` ({ri.rect}, {rj.rect})")
+                else:
+                    messages.append(f"FAILURE: intersection between {ri.rect_type} bounding box for `{ri.field['description']}` ({ri.rect}) and {rj.rect_type} bounding box for `{rj.field['description']}` ({rj.rect})")
+                if len(messages) >= 20:
+                    messages.append("Aborting further checks; fix bounding boxes and try again")
+                    return messages
+        if ri.rect_type == "entry":
+            if "entry_text" in ri.field:
+                font_size = ri.field["entry_text"].get("font_size", 14)
+                entry_height = ri.rect[3] - ri.rect[1]
+                if entry_height < font_size:
+                    has_error = True
+                    messages.append(f"FAILURE: entry bounding box height ({entry_height}) for `{ri.field['description']}` is too short for the text content (font size: {font_size}). Increase the box height or decrease the font size.")
+                    if len(messages) >= 20:
+                        messages.append("Aborting further checks; fix bounding boxes and try again")
+                        return messages
+
+    if not has_error:
+        messages.append("SUCCESS: All bounding boxes are valid")
+    return messages
+
+
+def synthetic_form(n_fields: int, overlaps: int = 0, seed: int = 0, per_page: int = 60, columns: int = 2) -> dict:
+    """A form laid out in `columns` columns of label/entry rows, `per_page` fields per page.
+
+    Rows shrink to fit a letter-size page, but never below 14pt, so a long
+    single column simply runs down a tall page. `overlaps` fields are nudged
+    onto a neighbour so the check has something to report.
+    """
+    rng = random.Random(seed)
+    fields = []
+    rows = -(-per_page // columns)
+    row_height = max(700 / rows, 14)
+    for n in range(n_fields):
+        page, slot = divmod(n, per_page)
+        column, row = divmod(slot, rows)
+        x = 40 + column * 280
+        top = 50 + row * row_height
+        bottom = top + row_height * 0.8
+        fields.append({
+            "page_number": page + 1,
+            "description": f"Field {n}",
+            "field_label": f"Label {n}",
+            "label_bounding_box": [x, top, x + 100, bottom],
+            "entry_bounding_box": [x + 105, top, x + 260, bottom],
+            "entry_text": {"text": "x", "font_size": 10},
+        })
+    for n in rng.sample(range(n_fields), min(overlaps, n_fields)):
+        x0, y0, x1, y1 = fields[n]["entry_bounding_box"]
+        dx, dy = rng.uniform(-120, 40), rng.uniform(-30, 30)
+        fields[n]["entry_bounding_box"] = [x0 + dx, y0 + dy, x1 + dx, y1 + dy]
+    return {"form_fields": fields}
+
+
+def time_check(fn, text: str) -> tuple[float, list[str]]:
+    start = time.perf_counter()
+    messages = fn(io.StringIO(text))
+    return time.perf_counter() - start, messages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="100,1000,10000,50000")
+    parser.add_argument("--legacy-max", type=int, default=2000, help="largest form to time the all-pairs scan on")
+    parser.add_argument("--cases", type=int, default=200, help="randomized equivalence cases")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    mismatches = 0
+    for case in range(args.cases):
+        n = rng.randint(1, 300)
+        form = synthetic_form(n, overlaps=rng.randint(0, n), seed=case,
+                              per_page=rng.choice([4, 20, 60, 300]), columns=rng.choice([1, 2]))
+        text = json.dumps(form)
+        if get_bounding_box_messages(io.StringIO(text)) != legacy_bounding_box_messages(io.StringIO(text)):
+            mismatches += 1
+    print(f"equivalence: {args.cases} cases, {mismatches} mismatches")
+
+    print(f"{'layout':>14} {'fields':>8} {'sweep s':>10} {'all-pairs s':>12}")
+    layouts = [("2 col, 60/page", 60, 2), ("1 col, 1 page", None, 1)]
+    for name, per_page, columns in layouts:
+        for size in (int(s) for s in args.sizes.split(",")):
+            text = json.dumps(synthetic_form(size, per_page=per_page or size, columns=columns))
+            sweep, messages = time_check(get_bounding_box_messages, text)
+            legacy = "-"
+            if size <= args.legacy_max:
+                seconds, expected = time_check(legacy_bounding_box_messages, text)
+                legacy = f"{seconds:.4f}"
+                assert messages == expected
+            print(f"{name:>14} {size:>8} {sweep:>10.4f} {legacy:>12}")
+
+
+if __name__ == "__main__":
+    main()
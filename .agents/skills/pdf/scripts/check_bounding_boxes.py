@@ -1,6 +1,8 @@
+from collections import defaultdict
 from dataclasses import dataclass
+import argparse
+import heapq
 import json
-import sys
 
 
 
@@ -12,54 +14,215 @@ class RectAndField:
     field: dict
 
 
-def get_bounding_box_messages(fields_json_stream) -> list[str]:
-    messages = []
-    fields = json.load(fields_json_stream)
-    messages.append(f"Read {len(fields['form_fields'])} fields")
+def rects_intersect(r1, r2):
+    disjoint_horizontal = r1[0] >= r2[2] or r1[2] <= r2[0]
+    disjoint_vertical = r1[1] >= r2[3] or r1[3] <= r2[1]
+    return not (disjoint_horizontal or disjoint_vertical)
+
+
+def sweep_cost(rects: list[list[float]], indexes: list[int], axis: int) -> int:
+    """Comparisons a sweep along `axis` (0 = x, 1 = y) would make: the summed size of the active set."""
+    active = []
+    cost = 0
+    for i in sorted(indexes, key=lambda i: rects[i][axis]):
+        start = rects[i][axis]
+        while active and active[0] <= start:
+            heapq.heappop(active)
+        cost += len(active)
+        heapq.heappush(active, rects[i][axis + 2])
+    return cost
+
+
+def find_intersections(rects_and_fields: list[RectAndField]) -> dict[int, list[int]]:
+    """Map each index i to the sorted indexes j > i whose rect intersects it on the same page.
+
+    Rects are bucketed by page and swept along whichever axis they overlap
+    less on (x for rows of fields, y for a single column): only rects whose
+    far edge lies past the current near edge are compared, so the cost is
+    O(n log n) plus the rects overlapping on that axis, instead of all pairs.
+    """
+    rects = [rf.rect for rf in rects_and_fields]
+    pages = defaultdict(list)
+    for i, rf in enumerate(rects_and_fields):
+        pages[rf.field["page_number"]].append(i)
+
+    hits = defaultdict(list)
+    for indexes in pages.values():
+        axis = min((0, 1), key=lambda axis: sweep_cost(rects, indexes, axis))
+        indexes.sort(key=lambda i: rects[i][axis])
+        active = []  # heap of (far edge, index) of rects that can still intersect
+        for j in indexes:
+            rect = rects[j]
+            while active and active[0][0] <= rect[axis]:
+                heapq.heappop(active)
+            for _, i in active:
+                if rects_intersect(rects[i], rect):
+                    hits[min(i, j)].append(max(i, j))
+            heapq.heappush(active, (rect[axis + 2], j))
+    for js in hits.values():
+        js.sort()
+    return hits
 
-    def rects_intersect(r1, r2):
-        disjoint_horizontal = r1[0] >= r2[2] or r1[2] <= r2[0]
-        disjoint_vertical = r1[1] >= r2[3] or r1[3] <= r2[1]
-        return not (disjoint_horizontal or disjoint_vertical)
 
+def load_rects_and_fields(fields: dict) -> list[RectAndField]:
     rects_and_fields = []
     for f in fields["form_fields"]:
         rects_and_fields.append(RectAndField(f["label_bounding_box"], "label", f))
         rects_and_fields.append(RectAndField(f["entry_bounding_box"], "entry", f))
+    return rects_and_fields
 
-    has_error = False
+
+def iter_problems(rects_and_fields: list[RectAndField]):
+    """Yield ("intersection", i, j) and ("too_short", i, None) in the order they are reported."""
+    hits = find_intersections(rects_and_fields)
     for i, ri in enumerate(rects_and_fields):
-        for j in range(i + 1, len(rects_and_fields)):
-            rj = rects_and_fields[j]
-            if ri.field["page_number"] == rj.field["page_number"] and rects_intersect(ri.rect, rj.rect):
-                has_error = True
-                if ri.field is rj.field:
-                    messages.append(f"FAILURE: intersection between label and entry bounding boxes for `{ri.field['description']}` ({ri.rect}, {rj.rect})")
-                else:
-                    messages.append(f"FAILURE: intersection between {ri.rect_type} bounding box for `{ri.field['description']}` ({ri.rect}) and {rj.rect_type} bounding box for `{rj.field['description']}` ({rj.rect})")
-                if len(messages) >= 20:
-                    messages.append("Aborting further checks; fix bounding boxes and try again")
-                    return messages
+        for j in hits.get(i, ()):
+            yield "intersection", i, j
         if ri.rect_type == "entry":
             if "entry_text" in ri.field:
                 font_size = ri.field["entry_text"].get("font_size", 14)
                 entry_height = ri.rect[3] - ri.rect[1]
                 if entry_height < font_size:
-                    has_error = True
-                    messages.append(f"FAILURE: entry bounding box height ({entry_height}) for `{ri.field['description']}` is too short for the text content (font size: {font_size}). Increase the box height or decrease the font size.")
-                    if len(messages) >= 20:
-                        messages.append("Aborting further checks; fix bounding boxes and try again")
-                        return messages
+                    yield "too_short", i, None
+
+
+def get_bounding_box_messages(fields_json_stream, limit=20) -> list[str]:
+    """Human-readable check results; stops after `limit` messages (None reports everything)."""
+    messages = []
+    fields = json.load(fields_json_stream)
+    messages.append(f"Read {len(fields['form_fields'])} fields")
+
+    rects_and_fields = load_rects_and_fields(fields)
+    has_error = False
+    for kind, i, j in iter_problems(rects_and_fields):
+        has_error = True
+        ri = rects_and_fields[i]
+        if kind == "too_short":
+            font_size = ri.field["entry_text"].get("font_size", 14)
+            entry_height = ri.rect[3] - ri.rect[1]
+            messages.append(f"FAILURE: entry bounding box height ({entry_height}) for `{ri.field['description']}` is too short for the text content (font size: {font_size}). Increase the box height or decrease the font size.")
+        elif ri.field is rects_and_fields[j].field:
+            messages.append(f"FAILURE: intersection between label and entry bounding boxes for `{ri.field['description']}` ({ri.rect}, {rects_and_fields[j].rect})")
+        else:
+            rj = rects_and_fields[j]
+            messages.append(f"FAILURE: intersection between {ri.rect_type} bounding box for `{ri.field['description']}` ({ri.rect}) and {rj.rect_type} bounding box for `{rj.field['description']}` ({rj.rect})")
+        if limit is not None and len(messages) >= limit:
+            messages.append("Aborting further checks; fix bounding boxes and try again")
+            return messages
 
     if not has_error:
         messages.append("SUCCESS: All bounding boxes are valid")
     return messages
 
+
+def separating_nudge(fixed, moving) -> dict:
+    """Smallest axis-aligned shift of `moving` that clears `fixed` (dx or dy, the other is 0)."""
+    options = [
+        (fixed[2] - moving[0], 0),
+        (fixed[0] - moving[2], 0),
+        (0, fixed[3] - moving[1]),
+        (0, fixed[1] - moving[3]),
+    ]
+    dx, dy = min(options, key=lambda d: abs(d[0]) + abs(d[1]))
+    return {"dx": dx, "dy": dy}
+
+
+def _box(rects_and_fields: list[RectAndField], index: int) -> dict:
+    rf = rects_and_fields[index]
+    return {
+        "field_index": index // 2,
+        "description": rf.field.get("description"),
+        "box": rf.rect_type,
+        "rect": rf.rect,
+    }
+
+
+def iter_bounding_box_issues(fields: dict):
+    """Yield every problem as a JSON-ready dict, in the same order as the messages.
+
+    Intersections carry the overlap rect and area plus a suggested nudge: the
+    smallest shift of one box that separates the pair. The entry box is moved
+    when one is involved (labels come from the PDF text and stay put),
+    otherwise the later box.
+    """
+    rects_and_fields = load_rects_and_fields(fields)
+    for kind, i, j in iter_problems(rects_and_fields):
+        ri = rects_and_fields[i]
+        if kind == "too_short":
+            font_size = ri.field["entry_text"].get("font_size", 14)
+            entry_height = ri.rect[3] - ri.rect[1]
+            yield {
+                "type": "entry_too_short",
+                "page": ri.field["page_number"],
+                "entry": _box(rects_and_fields, i),
+                "entry_height": entry_height,
+                "font_size": font_size,
+                "nudge": {"box": "entry", "grow_height_by": font_size - entry_height},
+            }
+            continue
+        rj = rects_and_fields[j]
+        overlap = [
+            max(ri.rect[0], rj.rect[0]),
+            max(ri.rect[1], rj.rect[1]),
+            min(ri.rect[2], rj.rect[2]),
+            min(ri.rect[3], rj.rect[3]),
+        ]
+        move = "b" if rj.rect_type == "entry" or ri.rect_type != "entry" else "a"
+        fixed, moving = (ri, rj) if move == "b" else (rj, ri)
+        yield {
+            "type": "intersection",
+            "page": ri.field["page_number"],
+            "same_field": ri.field is rj.field,
+            "a": _box(rects_and_fields, i),
+            "b": _box(rects_and_fields, j),
+            "overlap": overlap,
+            "overlap_area": max(overlap[2] - overlap[0], 0) * max(overlap[3] - overlap[1], 0),
+            "nudge": {"move": move, **separating_nudge(fixed.rect, moving.rect)},
+        }
+
+
+def get_bounding_box_report(fields_json_stream) -> dict:
+    """Every intersection and undersized entry in one pass, as structured JSON."""
+    fields = json.load(fields_json_stream)
+    issues = list(iter_bounding_box_issues(fields))
+    counts = defaultdict(int)
+    for issue in issues:
+        counts[issue["type"]] += 1
+    return {
+        "status": "failed" if issues else "ok",
+        "fields": len(fields["form_fields"]),
+        "counts": dict(counts),
+        "issues": issues,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check form field bounding boxes for overlaps and undersized entries")
+    parser.add_argument("fields_json")
+    parser.add_argument("--format", choices=["text", "json", "jsonl"], default="text",
+                        help="json: full report; jsonl: one issue per line as found, then a summary line")
+    parser.add_argument("--all", action="store_true", help="text format: do not stop after 20 messages")
+    args = parser.parse_args()
+
+    with open(args.fields_json) as f:
+        if args.format == "text":
+            for msg in get_bounding_box_messages(f, limit=None if args.all else 20):
+                print(msg)
+        elif args.format == "json":
+            print(json.dumps(get_bounding_box_report(f), indent=2))
+        else:
+            fields = json.load(f)
+            counts = defaultdict(int)
+            for issue in iter_bounding_box_issues(fields):
+                counts[issue["type"]] += 1
+                print(json.dumps(issue), flush=True)
+            print(json.dumps({
+                "type": "summary",
+                "status": "failed" if counts else "ok",
+                "fields": len(fields["form_fields"]),
+                "counts": dict(counts),
+            }))
+
+
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: check_bounding_boxes.py [fields.json]")
-        sys.exit(1)
-    with open(sys.argv[1]) as f:
-        messages = get_bounding_box_messages(f)
-    for msg in messages:
-        print(msg)
+    main()
@@ -1,6 +1,11 @@
+import hashlib
+import io
 import json
+import os
 import sys
+from pathlib import Path
 
+import pypdf
 from pypdf import PdfReader
 
 
@@ -107,9 +112,70 @@ def get_field_info(reader: PdfReader):
     return sorted_fields
 
 
+FIELD_INDEX_VERSION = 1
+FIELD_INDEX_DIR_ENV = "PDF_FIELD_INDEX_DIR"
+
+_field_index_memo = {}
+
+
+def field_index_dir() -> Path:
+    """Where field indexes are stored: $PDF_FIELD_INDEX_DIR or ~/.cache/pdf-field-index."""
+    return Path(os.environ.get(FIELD_INDEX_DIR_ENV) or Path.home() / ".cache" / "pdf-field-index")
+
+
+def load_field_index(content_hash: str, index_dir: Path):
+    """Indexed field info for `content_hash`, or None if missing, outdated or malformed."""
+    try:
+        with open(index_dir / f"{content_hash}.json") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(index, dict):
+        return None
+    if index.get("version") != FIELD_INDEX_VERSION or index.get("pypdf_version") != pypdf.__version__:
+        return None
+    fields = index.get("fields")
+    if not isinstance(fields, list) or not all(isinstance(field, dict) for field in fields):
+        return None
+    return fields
+
+
+def save_field_index(content_hash: str, field_info, index_dir: Path):
+    index = {"version": FIELD_INDEX_VERSION, "pypdf_version": pypdf.__version__, "fields": field_info}
+    try:
+        index_dir.mkdir(parents=True, exist_ok=True)
+        tmp = index_dir / f".{content_hash}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(index, f)
+        os.replace(tmp, index_dir / f"{content_hash}.json")
+    except OSError:
+        pass  # the index is only a cache; a read-only location just means no reuse
+
+
+def get_indexed_field_info(pdf_data: bytes, index_dir: Path = None):
+    """get_field_info for a PDF's bytes, reusing the index stored under their SHA-256.
+
+    The index holds exactly what get_field_info returns (as plain JSON values),
+    so a template that was seen before is never introspected again. Entries
+    are content-addressed and can't go stale; they are rebuilt when the
+    index format or the pypdf version changes.
+    """
+    content_hash = hashlib.sha256(pdf_data).hexdigest()
+    if content_hash in _field_index_memo:
+        return _field_index_memo[content_hash]
+
+    index_dir = index_dir or field_index_dir()
+    field_info = load_field_index(content_hash, index_dir)
+    if field_info is None:
+        # Round-trip through JSON so a fresh result matches one read from the index.
+        field_info = json.loads(json.dumps(get_field_info(PdfReader(io.BytesIO(pdf_data)))))
+        save_field_index(content_hash, field_info, index_dir)
+    _field_index_memo[content_hash] = field_info
+    return field_info
+
+
 def write_field_info(pdf_path: str, json_output_path: str):
-    reader = PdfReader(pdf_path)
-    field_info = get_field_info(reader)
+    field_info = get_indexed_field_info(Path(pdf_path).read_bytes())
     with open(json_output_path, "w") as f:
         json.dump(field_info, f, indent=2)
     print(f"Wrote {len(field_info)} fields to {json_output_path}")
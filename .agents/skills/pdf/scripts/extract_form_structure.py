@@ -9,105 +9,241 @@ This script analyzes the PDF to find:
 Output: A JSON file with the form structure that can be used to generate
 accurate field coordinates for filling.
 
-Usage: python extract_form_structure.py <input.pdf> <output.json>
+Pages are independent, so large documents can be split into page ranges
+extracted by a process pool (--workers). With --jsonl the output is written
+one page per line as extraction progresses instead of as a single document;
+either way pages come out in page order. --pages limits extraction to a
+selection such as "3-5"; only selected pages are loaded, and each page's
+cached layout is released once it is extracted, so memory stays bounded
+however long the document is.
+
+Usage: python extract_form_structure.py <input.pdf> <output.json> [--pages 3-5] [--workers N] [--jsonl]
 """
 
+import argparse
 import json
-import sys
 import pdfplumber
 
 
-def extract_form_structure(pdf_path):
-    structure = {
-        "pages": [],
+def extract_page(page, page_num):
+    """Structure of one pdfplumber page; same keys as the document, plus "page"."""
+    result = {
+        "page": {
+            "page_number": page_num,
+            "width": float(page.width),
+            "height": float(page.height)
+        },
         "labels": [],
         "lines": [],
         "checkboxes": [],
         "row_boundaries": []
     }
 
-    with pdfplumber.open(pdf_path) as pdf:
-        for page_num, page in enumerate(pdf.pages, 1):
-            structure["pages"].append({
-                "page_number": page_num,
-                "width": float(page.width),
-                "height": float(page.height)
+    words = page.extract_words()
+    for word in words:
+        result["labels"].append({
+            "page": page_num,
+            "text": word["text"],
+            "x0": round(float(word["x0"]), 1),
+            "top": round(float(word["top"]), 1),
+            "x1": round(float(word["x1"]), 1),
+            "bottom": round(float(word["bottom"]), 1)
+        })
+
+    for line in page.lines:
+        if abs(float(line["x1"]) - float(line["x0"])) > page.width * 0.5:
+            result["lines"].append({
+                "page": page_num,
+                "y": round(float(line["top"]), 1),
+                "x0": round(float(line["x0"]), 1),
+                "x1": round(float(line["x1"]), 1)
             })
 
-            words = page.extract_words()
-            for word in words:
-                structure["labels"].append({
-                    "page": page_num,
-                    "text": word["text"],
-                    "x0": round(float(word["x0"]), 1),
-                    "top": round(float(word["top"]), 1),
-                    "x1": round(float(word["x1"]), 1),
-                    "bottom": round(float(word["bottom"]), 1)
-                })
-
-            for line in page.lines:
-                if abs(float(line["x1"]) - float(line["x0"])) > page.width * 0.5:
-                    structure["lines"].append({
-                        "page": page_num,
-                        "y": round(float(line["top"]), 1),
-                        "x0": round(float(line["x0"]), 1),
-                        "x1": round(float(line["x1"]), 1)
-                    })
-
-            for rect in page.rects:
-                width = float(rect["x1"]) - float(rect["x0"])
-                height = float(rect["bottom"]) - float(rect["top"])
-                if 5 <= width <= 15 and 5 <= height <= 15 and abs(width - height) < 2:
-                    structure["checkboxes"].append({
-                        "page": page_num,
-                        "x0": round(float(rect["x0"]), 1),
-                        "top": round(float(rect["top"]), 1),
-                        "x1": round(float(rect["x1"]), 1),
-                        "bottom": round(float(rect["bottom"]), 1),
-                        "center_x": round((float(rect["x0"]) + float(rect["x1"])) / 2, 1),
-                        "center_y": round((float(rect["top"]) + float(rect["bottom"])) / 2, 1)
-                    })
-
-    lines_by_page = {}
-    for line in structure["lines"]:
-        page = line["page"]
-        if page not in lines_by_page:
-            lines_by_page[page] = []
-        lines_by_page[page].append(line["y"])
-
-    for page, y_coords in lines_by_page.items():
-        y_coords = sorted(set(y_coords))
-        for i in range(len(y_coords) - 1):
-            structure["row_boundaries"].append({
-                "page": page,
-                "row_top": y_coords[i],
-                "row_bottom": y_coords[i + 1],
-                "row_height": round(y_coords[i + 1] - y_coords[i], 1)
+    for rect in page.rects:
+        width = float(rect["x1"]) - float(rect["x0"])
+        height = float(rect["bottom"]) - float(rect["top"])
+        if 5 <= width <= 15 and 5 <= height <= 15 and abs(width - height) < 2:
+            result["checkboxes"].append({
+                "page": page_num,
+                "x0": round(float(rect["x0"]), 1),
+                "top": round(float(rect["top"]), 1),
+                "x1": round(float(rect["x1"]), 1),
+                "bottom": round(float(rect["bottom"]), 1),
+                "center_x": round((float(rect["x0"]) + float(rect["x1"])) / 2, 1),
+                "center_y": round((float(rect["top"]) + float(rect["bottom"])) / 2, 1)
             })
 
+    y_coords = sorted(set(line["y"] for line in result["lines"]))
+    for i in range(len(y_coords) - 1):
+        result["row_boundaries"].append({
+            "page": page_num,
+            "row_top": y_coords[i],
+            "row_bottom": y_coords[i + 1],
+            "row_height": round(y_coords[i + 1] - y_coords[i], 1)
+        })
+
+    return result
+
+
+def release_page(page):
+    """Drop pdfplumber's cached objects and layout of a page that is done."""
+    close = getattr(page, "close", None) or page.flush_cache
+    close()
+
+
+def parse_page_spec(spec, page_count):
+    """Sorted, unique 1-based page numbers for a spec like "3-5", "1,4,7-9" or "10-"."""
+    selected = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        first, sep, last = part.partition("-")
+        try:
+            first = int(first) if first.strip() else 1
+            last = (int(last) if last.strip() else page_count) if sep else first
+        except ValueError:
+            raise ValueError(f"invalid page range: {part!r}") from None
+        if not 1 <= first <= last <= page_count:
+            raise ValueError(f"page range {part!r} is outside 1-{page_count}")
+        selected.update(range(first, last + 1))
+    if not selected:
+        raise ValueError(f"no pages selected by {spec!r}")
+    return sorted(selected)
+
+
+def iter_pages(pdf_path, page_numbers=None):
+    """Yield per-page results for `page_numbers` (all pages if None), loading only those pages."""
+    with pdfplumber.open(pdf_path, pages=page_numbers) as pdf:
+        for page in pdf.pages:
+            result = extract_page(page, page.page_number)
+            release_page(page)
+            yield result
+
+
+def extract_page_chunk(pdf_path, page_numbers):
+    """Per-page results for a chunk of page numbers; runs in a worker process."""
+    return list(iter_pages(pdf_path, page_numbers))
+
+
+def page_chunks(page_numbers, workers):
+    """Split page numbers into consecutive chunks, a few per worker to balance uneven pages."""
+    size = max(1, -(-len(page_numbers) // (workers * 4)))
+    return [page_numbers[i:i + size] for i in range(0, len(page_numbers), size)]
+
+
+def select_pages(pdf_path, spec=None):
+    """Page numbers selected by `spec` (see parse_page_spec); every page when None."""
+    with pdfplumber.open(pdf_path) as pdf:
+        page_count = len(pdf.pages)
+    if spec is None:
+        return list(range(1, page_count + 1))
+    return parse_page_spec(spec, page_count)
+
+
+def iter_page_structures(pdf_path, workers=1, pages=None):
+    """Yield per-page results in page order, extracting chunks in parallel when workers > 1.
+
+    `pages` is a list of 1-based page numbers; None extracts every page. At most
+    2 * workers chunks are in flight or waiting to be consumed at a time.
+    """
+    if workers <= 1:
+        yield from iter_pages(pdf_path, pages)
+        return
+
+    page_numbers = pages if pages is not None else select_pages(pdf_path)
+
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+    from itertools import islice
+
+    chunks = page_chunks(page_numbers, workers)
+    if not chunks:
+        return
+    pending = iter(chunks)
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+        # A bounded window of chunks is in flight, consumed in submission order so
+        # output is deterministic; each consumed chunk makes room for the next one.
+        window = deque(pool.submit(extract_page_chunk, pdf_path, chunk)
+                       for chunk in islice(pending, workers * 2))
+        while window:
+            results = window.popleft().result()
+            chunk = next(pending, None)
+            if chunk is not None:
+                window.append(pool.submit(extract_page_chunk, pdf_path, chunk))
+            yield from results
+
+
+def extract_form_structure(pdf_path, workers=1, pages=None):
+    structure = {
+        "pages": [],
+        "labels": [],
+        "lines": [],
+        "checkboxes": [],
+        "row_boundaries": []
+    }
+
+    for result in iter_page_structures(pdf_path, workers, pages):
+        structure["pages"].append(result["page"])
+        for key in ("labels", "lines", "checkboxes", "row_boundaries"):
+            structure[key].extend(result[key])
+
     return structure
 
 
-def main():
-    if len(sys.argv) != 3:
-        print("Usage: extract_form_structure.py <input.pdf> <output.json>")
-        sys.exit(1)
+def write_jsonl(pdf_path, output_path, workers=1, pages=None):
+    """Write one JSON line per page as soon as it and every earlier page are done.
 
-    pdf_path = sys.argv[1]
-    output_path = sys.argv[2]
+    Only the chunks in flight (at most 2 * workers) are held in memory. Returns
+    totals per key.
+    """
+    counts = {"pages": 0, "labels": 0, "lines": 0, "checkboxes": 0, "row_boundaries": 0}
+    with open(output_path, "w") as f:
+        for result in iter_page_structures(pdf_path, workers, pages):
+            f.write(json.dumps(result) + "\n")
+            f.flush()
+            counts["pages"] += 1
+            for key in ("labels", "lines", "checkboxes", "row_boundaries"):
+                counts[key] += len(result[key])
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract form structure from a non-fillable PDF")
+    parser.add_argument("pdf_path")
+    parser.add_argument("output_path")
+    parser.add_argument("--pages", help='pages to extract, e.g. "3-5" or "1,4,7-" (default: all)')
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes extracting page ranges in parallel")
+    parser.add_argument("--jsonl", action="store_true", help="write one JSON object per page, streamed")
+    args = parser.parse_args()
+
+    pdf_path = args.pdf_path
+    output_path = args.output_path
+
+    pages = None
+    if args.pages is not None:
+        try:
+            pages = select_pages(pdf_path, args.pages)
+        except ValueError as exc:
+            parser.error(str(exc))
 
     print(f"Extracting structure from {pdf_path}...")
-    structure = extract_form_structure(pdf_path)
+    if args.jsonl:
+        counts = write_jsonl(pdf_path, output_path, args.workers, pages)
+    else:
+        structure = extract_form_structure(pdf_path, args.workers, pages)
 
-    with open(output_path, "w") as f:
-        json.dump(structure, f, indent=2)
+        with open(output_path, "w") as f:
+            json.dump(structure, f, indent=2)
+        counts = {key: len(value) for key, value in structure.items()}
 
     print(f"Found:")
-    print(f"  - {len(structure['pages'])} pages")
-    print(f"  - {len(structure['labels'])} text labels")
-    print(f"  - {len(structure['lines'])} horizontal lines")
-    print(f"  - {len(structure['checkboxes'])} checkboxes")
-    print(f"  - {len(structure['row_boundaries'])} row boundaries")
+    print(f"  - {counts['pages']} pages")
+    print(f"  - {counts['labels']} text labels")
+    print(f"  - {counts['lines']} horizontal lines")
+    print(f"  - {counts['checkboxes']} checkboxes")
+    print(f"  - {counts['row_boundaries']} row boundaries")
     print(f"Saved to {output_path}")
 
 
@@ -1,9 +1,11 @@
+import io
 import json
 import sys
+from pathlib import Path
 
 from pypdf import PdfReader, PdfWriter
 
-from extract_form_field_info import get_field_info
+from extract_form_field_info import get_indexed_field_info
 
 
 
@@ -20,10 +22,10 @@ def fill_pdf_fields(input_pdf_path: str, fields_json_path: str, output_pdf_path:
                 fields_by_page[page] = {}
             fields_by_page[page][field_id] = field["value"]
     
-    reader = PdfReader(input_pdf_path)
+    pdf_data = Path(input_pdf_path).read_bytes()
 
     has_error = False
-    field_info = get_field_info(reader)
+    field_info = get_indexed_field_info(pdf_data)
     fields_by_ids = {f["field_id"]: f for f in field_info}
     for field in fields:
         existing_field = fields_by_ids.get(field["field_id"])
@@ -42,7 +44,7 @@ def fill_pdf_fields(input_pdf_path: str, fields_json_path: str, output_pdf_path:
     if has_error:
         sys.exit(1)
 
-    writer = PdfWriter(clone_from=reader)
+    writer = PdfWriter(clone_from=PdfReader(io.BytesIO(pdf_data)))
     for page, field_values in fields_by_page.items():
         writer.update_page_form_field_values(writer.pages[page - 1], field_values, auto_regenerate=False)
 
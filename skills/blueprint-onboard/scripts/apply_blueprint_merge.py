@@ -16,13 +16,19 @@ from __future__ import annotations
 
 import argparse
 import datetime as dt
+import hashlib
 import json
 import re
-import subprocess
-import tempfile
-from copy import deepcopy
+from contextlib import ExitStack
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Callable, Dict, List, Tuple
+
+from mermaid_parser import extract_mermaid_block, parse_mermaid
+from render_blueprint import output_paths, render_outputs
+from story_index import INDEX_FILE, build_story_index, dump_story_index
+from staged_writes import StampAfter, blueprint_lock, commit_files, recover_staged_writes
+from story_loader import STATE_DIR, STORY_TEMPLATE_NAME, ensure_state_dir, load_story_frontmatters, scan_story_stamps
+from yaml_loader import safe_load
 
 AUTO_START = "<!-- AUTO:START -->"
 AUTO_END = "<!-- AUTO:END -->"
@@ -31,6 +37,13 @@ MANUAL_END = "<!-- MANUAL:END -->"
 MODEL_START = "<!-- AUTO:MODEL:BEGIN -->"
 MODEL_END = "<!-- AUTO:MODEL:END -->"
 
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 1
+SNAPSHOT_FILE = "model.json"
+SNAPSHOT_VERSION = 1
+ETAG_RE = re.compile(rb'^\{"version":(\d+),"checksum":"([0-9a-f]{64})"')
+MERGE_ATTEMPTS = 3
+
 
 def normalize_scalar_types(value: Any) -> Any:
     if isinstance(value, (dt.date, dt.datetime)):
@@ -42,13 +55,18 @@ def normalize_scalar_types(value: Any) -> Any:
     return value
 
 
+def _json_default(o: Any) -> Any:
+    if isinstance(o, (dt.date, dt.datetime)):
+        return o.isoformat()
+    return str(o)
+
+
 def dumps_json(data: Any) -> str:
-    def _default(o: Any) -> Any:
-        if isinstance(o, (dt.date, dt.datetime)):
-            return o.isoformat()
-        return str(o)
+    return json.dumps(data, ensure_ascii=False, indent=2, default=_json_default)
+
 
-    return json.dumps(data, ensure_ascii=False, indent=2, default=_default)
+def canonical_json(data: Any) -> str:
+    return json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=_json_default)
 
 
 def parse_input_file(path: Path) -> Dict[str, Any]:
@@ -58,27 +76,16 @@ def parse_input_file(path: Path) -> Dict[str, Any]:
         data = json.loads(raw)
     else:
         try:
-            import yaml  # type: ignore
-        except Exception as exc:
+            data = safe_load(raw)
+        except ImportError as exc:
             raise RuntimeError(
                 "YAML input requires pyyaml. Install: python3 -m pip install --user pyyaml"
             ) from exc
-        data = yaml.safe_load(raw)
     if not isinstance(data, dict):
         raise ValueError("Input root must be object/map")
     return normalize_scalar_types(data)
 
 
-def dump_yaml(path: Path, data: Dict[str, Any]) -> None:
-    try:
-        import yaml  # type: ignore
-    except Exception as exc:
-        raise RuntimeError(
-            "YAML output requires pyyaml. Install: python3 -m pip install --user pyyaml"
-        ) from exc
-    path.write_text(yaml.safe_dump(data, allow_unicode=True, sort_keys=False), encoding="utf-8")
-
-
 def parse_managed_sections(text: str) -> Tuple[str, str] | None:
     pattern = re.compile(
         re.escape(AUTO_START)
@@ -122,15 +129,13 @@ def read_auto_markdown(path: Path) -> str:
     return extract_auto_content(path.read_text(encoding="utf-8"))
 
 
-def extract_mermaid_block(md: str) -> str:
-    m = re.search(r"```mermaid\n(.*?)```", md, re.DOTALL)
-    if not m:
-        return ""
-    return m.group(1).strip()
+NODE_LABEL_RE = re.compile(r"^([A-Z]+-\d+)\s+(.+)$")
+BLOCKED_SUFFIX_RE = re.compile(r"^(.*)\s+\[blocked:\s*(.+)\]$")
+WINDOW_RE = re.compile(r"^(\d{4}-\d{2}-\d{2})\s*~\s*(\d{4}-\d{2}-\d{2})$")
 
 
 def parse_node_label(label: str) -> Tuple[str, str]:
-    m = re.match(r"^([A-Z]+-\d+)\s+(.+)$", label.strip())
+    m = NODE_LABEL_RE.match(label.strip())
     if not m:
         return "", label.strip()
     return m.group(1).strip(), m.group(2).strip()
@@ -156,46 +161,30 @@ def strip_model_comments(auto_content: str) -> str:
     return pattern.sub("", auto_content).strip()
 
 
-def parse_story_frontmatter(path: Path) -> Dict[str, Any] | None:
-    if not path.exists():
-        return None
-    raw = extract_auto_content(path.read_text(encoding="utf-8"))
-    m = re.match(r"^---\n(.*?)\n---\n", raw, re.DOTALL)
-    if not m:
-        return None
-    try:
-        import yaml  # type: ignore
-        data = yaml.safe_load(m.group(1))
-    except Exception:
-        return None
-    return data if isinstance(data, dict) else None
-
-
 def parse_dependencies_model(path: Path) -> Dict[str, Any]:
     block = extract_mermaid_block(read_auto_markdown(path))
     deps: Dict[str, Any] = {"capabilities": [], "externals": [], "edges": []}
     if not block:
         return deps
 
+    doc = parse_mermaid(block)
     safe_to_real: Dict[str, str] = {}
     capabilities: Dict[str, Dict[str, Any]] = {}
     externals: Dict[str, Dict[str, Any]] = {}
 
-    for raw in block.splitlines():
-        line = raw.strip()
-        m = re.match(r'^([A-Za-z0-9_]+)\["([^"]+)"\]:::(normal|risk|ext)\s*$', line)
-        if not m:
+    for node in doc["nodes"]:
+        cls = node["cls"]
+        if cls not in {"normal", "risk", "ext"}:
             continue
-        safe_id, label, cls = m.group(1), m.group(2), m.group(3)
-        real_id, title = parse_node_label(label)
+        real_id, title = parse_node_label(node["label"])
         if not real_id:
             continue
         blocked_reason = ""
-        b = re.match(r"^(.*)\s+\[blocked:\s*(.+)\]$", title)
+        b = BLOCKED_SUFFIX_RE.match(title)
         if b:
             title = b.group(1).strip()
             blocked_reason = b.group(2).strip()
-        safe_to_real[safe_id] = real_id
+        safe_to_real[node["id"]] = real_id
         if cls == "ext" or real_id.startswith("EXT-"):
             externals[real_id] = {"id": real_id, "title": title}
         else:
@@ -206,14 +195,12 @@ def parse_dependencies_model(path: Path) -> Dict[str, Any]:
             capabilities[real_id] = cap
 
     edge_seen = set()
-    for raw in block.splitlines():
-        line = raw.strip()
-        m = re.match(r'^([A-Za-z0-9_]+)\s+-->(?:\|"([^"]*)"\|)?\s+([A-Za-z0-9_]+)\s*$', line)
-        if not m:
-            continue
-        from_safe, reason, to_safe = m.group(1), (m.group(2) or "").strip(), m.group(3)
-        from_id = safe_to_real.get(from_safe, from_safe)
-        to_id = safe_to_real.get(to_safe, to_safe)
+    # per-capability (dep id, reason) index keeps de-duplication O(1) for hub capabilities
+    dep_index: Dict[str, set] = {}
+    for edge in doc["edges"]:
+        reason = edge["label"]
+        from_id = safe_to_real.get(edge["from"], edge["from"])
+        to_id = safe_to_real.get(edge["to"], edge["to"])
         key = (from_id, to_id, reason)
         if key in edge_seen:
             continue
@@ -225,15 +212,14 @@ def parse_dependencies_model(path: Path) -> Dict[str, Any]:
             if cap is None:
                 cap = {"id": to_id, "title": to_id, "depends_on": []}
                 capabilities[to_id] = cap
+            seen = dep_index.setdefault(to_id, set())
+            if (from_id, reason) in seen:
+                continue
+            seen.add((from_id, reason))
             dep_obj = {"id": from_id}
             if reason:
                 dep_obj["reason"] = reason
-            exists = any(
-                isinstance(d, dict) and d.get("id") == dep_obj["id"] and d.get("reason", "") == dep_obj.get("reason", "")
-                for d in cap.get("depends_on", [])
-            )
-            if not exists:
-                cap.setdefault("depends_on", []).append(dep_obj)
+            cap.setdefault("depends_on", []).append(dep_obj)
 
     deps["capabilities"] = [capabilities[k] for k in sorted(capabilities.keys())]
     deps["externals"] = [externals[k] for k in sorted(externals.keys())]
@@ -248,37 +234,28 @@ def parse_milestones_model(path: Path) -> List[Dict[str, Any]]:
 
     by_id: Dict[str, Dict[str, Any]] = {}
     current_id = ""
-
-    for raw in block.splitlines():
-        line = raw.strip()
-        if not line or line in {"gantt"} or line.startswith("title ") or line.startswith("dateFormat ") or line.startswith("axisFormat "):
+    status_map = {"active": "doing", "done": "done", "crit": "blocked"}
+
+    for section in parse_mermaid(block)["sections"]:
+        # Only `section M-xxx <title>` opens a milestone; anything else keeps the current one.
+        if section["id"].startswith("M-") and len(section["id"]) > 2 and section["title"]:
+            current_id = section["id"]
+            by_id.setdefault(current_id, {"id": current_id, "title": section["title"], "items": []})
+        if not current_id:
             continue
 
-        m_section = re.match(r"^section\s+(M-[^\s]+)\s+(.+)$", line)
-        if m_section:
-            current_id = m_section.group(1).strip()
-            by_id.setdefault(current_id, {"id": current_id, "title": m_section.group(2).strip(), "items": []})
-            continue
+        for checkpoint in section["checkpoints"]:
+            by_id[current_id]["checkpoint"] = {"title": checkpoint["title"], "date": checkpoint["date"]}
 
-        m_checkpoint = re.match(r"^(.+?)\s+:milestone,\s*([A-Za-z0-9_]+),\s*(\d{4}-\d{2}-\d{2}),\s*1d$", line)
-        if m_checkpoint and current_id:
-            by_id[current_id]["checkpoint"] = {"title": m_checkpoint.group(1).strip(), "date": m_checkpoint.group(3).strip()}
-            continue
-
-        m_item = re.match(r"^(.+?)\s+:(?:(active|done|crit),\s*)?([A-Za-z0-9_]+),\s*(\d{4}-\d{2}-\d{2}),\s*(\d{4}-\d{2}-\d{2})$", line)
-        if m_item and current_id:
-            label = m_item.group(1).strip()
-            status_token = (m_item.group(2) or "").strip()
-            start = m_item.group(4).strip()
-            end = m_item.group(5).strip()
+        for task in section["tasks"]:
+            label = task["label"]
             item_id, item_title = parse_node_label(label)
             if not item_id:
                 item_id = label
                 item_title = label
-            status_map = {"active": "doing", "done": "done", "crit": "blocked"}
-            item: Dict[str, Any] = {"id": item_id, "title": item_title, "start": start, "end": end}
-            if status_token in status_map:
-                item["status"] = status_map[status_token]
+            item: Dict[str, Any] = {"id": item_id, "title": item_title, "start": task["start"], "end": task["end"]}
+            if task["status"] in status_map:
+                item["status"] = status_map[task["status"]]
             by_id[current_id].setdefault("items", []).append(item)
 
     # Parse supplemental markdown table rows for window/scope/dod.
@@ -297,7 +274,7 @@ def parse_milestones_model(path: Path) -> List[Dict[str, Any]]:
         milestone = by_id.setdefault(milestone_id, {"id": milestone_id, "title": cells[1], "items": []})
         milestone["title"] = cells[1]
         if "~" in cells[2]:
-            w = re.match(r"^(\d{4}-\d{2}-\d{2})\s*~\s*(\d{4}-\d{2}-\d{2})$", cells[2])
+            w = WINDOW_RE.match(cells[2])
             if w:
                 milestone["start"] = w.group(1)
                 milestone["end"] = w.group(2)
@@ -315,47 +292,135 @@ def parse_arch_subgraph(path: Path) -> Tuple[List[Dict[str, Any]], List[Dict[str
     if not block:
         return [], []
 
+    doc = parse_mermaid(block)
     groups: List[Dict[str, Any]] = []
+    for sub in doc["subgraphs"]:
+        nodes: List[Dict[str, Any]] = []
+        for node in sub["nodes"]:
+            if node["cls"]:
+                continue
+            node_id = node["id"]
+            label = node["label"].strip()
+            if label.startswith(f"{node_id} "):
+                label = label[len(node_id) + 1 :].strip()
+            nodes.append({"id": node_id, "title": label})
+        groups.append({"id": sub["id"], "title": sub["title"].strip(), "nodes": nodes})
+
     edges: List[Dict[str, Any]] = []
-    current: Dict[str, Any] | None = None
+    for e in doc["edges"]:
+        edge: Dict[str, Any] = {"from": e["from"], "to": e["to"]}
+        if e["label"]:
+            edge["label"] = e["label"]
+        edges.append(edge)
 
-    for raw in block.splitlines():
-        line = raw.strip()
-        if not line or line.startswith("flowchart "):
-            continue
+    return groups, edges
 
-        m_sub = re.match(r'^subgraph\s+([A-Za-z0-9_]+)\["([^"]+)"\]\s*$', line)
-        if m_sub:
-            current = {"id": m_sub.group(1).strip(), "title": m_sub.group(2).strip(), "nodes": []}
-            groups.append(current)
-            continue
 
-        if line == "end":
-            current = None
-            continue
+def file_stamp(path: Path) -> List[int] | None:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
 
-        m_edge = re.match(r'^([A-Za-z0-9_]+)\s+-->(?:\|"([^"]*)"\|)?\s+([A-Za-z0-9_]+)\s*$', line)
-        if m_edge:
-            edge: Dict[str, Any] = {"from": m_edge.group(1), "to": m_edge.group(3)}
-            label = (m_edge.group(2) or "").strip()
-            if label:
-                edge["label"] = label
-            edges.append(edge)
-            continue
 
-        if current is not None:
-            m_node = re.match(r'^([A-Za-z0-9_]+)\["([^"]+)"\]\s*$', line)
-            if m_node:
-                node_id = m_node.group(1).strip()
-                label = m_node.group(2).strip()
-                if label.startswith(f"{node_id} "):
-                    label = label[len(node_id) + 1 :].strip()
-                current["nodes"].append({"id": node_id, "title": label})
+def story_file_names(blueprint_dir: Path) -> List[str]:
+    stories_dir = blueprint_dir / "Stories"
+    if not stories_dir.exists():
+        return []
+    return sorted(p.name for p in stories_dir.glob("US-*.md"))
+
+
+def model_state_files(
+    blueprint_dir: Path, model: Dict[str, Any], rel_paths: List[str]
+) -> Tuple[str, Callable[[StampAfter], Dict[str, str]]]:
+    """The blueprint etag of `model`, and a `commit_files` callback staging its state.
+
+    The callback renders the model snapshot and the story index with the
+    mtime/size the files in `rel_paths` will have once committed, so both land
+    in the same journal as the views. The snapshot lets a later run tell
+    whether anything was edited by hand since; its model checksum doubles as
+    the etag (see `read_model_etag`).
+    """
+    model_json = canonical_json(model)
+    checksum = content_hash(model_json)
+
+    def derive(stamp_after: StampAfter) -> Dict[str, str]:
+        files: Dict[str, List[int]] = {}
+        for rel in rel_paths:
+            stamp = stamp_after(rel)
+            if stamp is not None:
+                files[rel] = stamp
+        payload = '{"version":%d,"checksum":"%s","files":%s,"model":%s}' % (
+            SNAPSHOT_VERSION,
+            checksum,
+            canonical_json(files),
+            model_json,
+        )
 
-    return groups, edges
+        names = set(scan_story_stamps(blueprint_dir / "Stories"))
+        names.update(rel.split("/", 1)[1] for rel in rel_paths if is_story_output(rel))
+        names.discard(STORY_TEMPLATE_NAME)
+        story_stamps: Dict[str, List[int]] = {}
+        for name in names:
+            stamp = stamp_after(f"Stories/{name}")
+            if stamp is not None:
+                story_stamps[name] = stamp
+        index = build_story_index(model.get("stories", []), story_stamps)
+
+        return {
+            f"{STATE_DIR}/{SNAPSHOT_FILE}": payload,
+            f"{STATE_DIR}/{INDEX_FILE}": dump_story_index(index),
+        }
+
+    return checksum, derive
+
+
+def read_model_etag(blueprint_dir: Path) -> str | None:
+    """Version of the last committed model: the snapshot checksum, read without parsing the model."""
+    try:
+        with (blueprint_dir / STATE_DIR / SNAPSHOT_FILE).open("rb") as fh:
+            head = fh.read(128)
+    except FileNotFoundError:
+        return None
+    m = ETAG_RE.match(head)
+    if not m or int(m.group(1)) != SNAPSHOT_VERSION:
+        return None
+    return m.group(2).decode("ascii")
+
+
+def load_model_snapshot(blueprint_dir: Path) -> Dict[str, Any] | None:
+    """Return the snapshot model if no rendered file changed since it was saved."""
+    path = blueprint_dir / STATE_DIR / SNAPSHOT_FILE
+    if not path.exists():
+        return None
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    if not isinstance(data, dict) or data.get("version") != SNAPSHOT_VERSION:
+        return None
+    model = data.get("model")
+    files = data.get("files")
+    if not isinstance(model, dict) or not isinstance(files, dict):
+        return None
+    if data.get("checksum") != content_hash(canonical_json(model)):
+        return None
+
+    recorded_stories = sorted(rel.split("/", 1)[1] for rel in files if is_story_output(rel))
+    if recorded_stories != story_file_names(blueprint_dir):
+        return None
+    for rel, stamp in files.items():
+        if file_stamp(blueprint_dir / rel) != stamp:
+            return None
+    return model
 
 
 def build_existing_model(blueprint_dir: Path) -> Dict[str, Any]:
+    snapshot = load_model_snapshot(blueprint_dir)
+    if snapshot is not None:
+        return snapshot
+
     model: Dict[str, Any] = {
         "project": {"name": blueprint_dir.parent.name},
         "stories": [],
@@ -381,14 +446,9 @@ def build_existing_model(blueprint_dir: Path) -> Dict[str, Any]:
             if m_name:
                 model["project"]["name"] = m_name.group(1).strip()
 
-    stories_dir = blueprint_dir / "Stories"
-    if stories_dir.exists():
-        for p in sorted(stories_dir.glob("US-*.md")):
-            if p.name == "US-xxx.md":
-                continue
-            fm = parse_story_frontmatter(p)
-            if fm:
-                model["stories"].append(fm)
+    for _, (fm, _) in load_story_frontmatters(blueprint_dir / "Stories"):
+        if fm:
+            model["stories"].append(fm)
 
     model["dependencies"] = parse_dependencies_model(blueprint_dir / "Roadmap" / "Dependencies.md")
     model["milestones"] = parse_milestones_model(blueprint_dir / "Roadmap" / "Milestones.md")
@@ -411,18 +471,47 @@ def build_existing_model(blueprint_dir: Path) -> Dict[str, Any]:
     return model
 
 
+def dependency_key(dep: Any) -> Tuple[str, str] | None:
+    if isinstance(dep, dict):
+        return str(dep.get("id", "")), str(dep.get("reason", ""))
+    if isinstance(dep, str):
+        return dep, ""
+    return None
+
+
+def dedupe_depends_on(capabilities: List[Dict[str, Any]]) -> None:
+    """Drop repeated (dep id, reason) entries from each capability's depends_on, keeping order.
+
+    Capabilities with duplicates are replaced in the list by an updated copy.
+    """
+    for i, cap in enumerate(capabilities):
+        depends_on = cap.get("depends_on")
+        if not isinstance(depends_on, list) or len(depends_on) < 2:
+            continue
+        seen = set()
+        unique = []
+        for dep in depends_on:
+            key = dependency_key(dep)
+            if key is not None:
+                if key in seen:
+                    continue
+                seen.add(key)
+            unique.append(dep)
+        if len(unique) != len(depends_on):
+            capabilities[i] = {**cap, "depends_on": unique}
+
+
 def normalize_model(model: Dict[str, Any]) -> Dict[str, Any]:
-    out = deepcopy(model)
-    out.setdefault("project", {})
-    if not isinstance(out["project"], dict):
-        out["project"] = {}
+    """Shallow, defaulted view of `model`; entity records are shared, never copied."""
+    out = dict(model)
+    out["project"] = dict(out["project"]) if isinstance(out.get("project"), dict) else {}
     out.setdefault("stories", [])
-    out.setdefault("dependencies", {"capabilities": [], "externals": [], "edges": []})
-    if not isinstance(out["dependencies"], dict):
-        out["dependencies"] = {"capabilities": [], "externals": [], "edges": []}
-    out["dependencies"].setdefault("capabilities", [])
-    out["dependencies"].setdefault("externals", [])
-    out["dependencies"].setdefault("edges", [])
+    deps = out.get("dependencies")
+    deps = dict(deps) if isinstance(deps, dict) else {}
+    deps.setdefault("capabilities", [])
+    deps.setdefault("externals", [])
+    deps.setdefault("edges", [])
+    out["dependencies"] = deps
     out.setdefault("milestones", [])
     out.setdefault("architecture", {})
     if not isinstance(out["architecture"], dict):
@@ -487,13 +576,15 @@ def merge_list_by_id(
     resolutions: Dict[str, Any],
     report: Dict[str, Any],
 ) -> List[Dict[str, Any]]:
+    """Merge by id, copy-on-write: unchanged records are returned as-is and only
+    records that actually change are shallow-copied before being updated."""
     table: Dict[str, Dict[str, Any]] = {}
     for item in existing:
         if not isinstance(item, dict):
             continue
         entity_id = str(item.get(id_field, "")).strip()
         if entity_id:
-            table[entity_id] = deepcopy(item)
+            table[entity_id] = item
 
     for inc in incoming:
         if not isinstance(inc, dict):
@@ -504,11 +595,11 @@ def merge_list_by_id(
             continue
 
         if entity_id not in table:
-            table[entity_id] = deepcopy(inc)
+            table[entity_id] = inc
             report["created"].append(f"{entity_type}:{entity_id}")
             continue
 
-        cur = deepcopy(table[entity_id])
+        cur = table[entity_id]
         changed = False
         for field, new_value in inc.items():
             if field == id_field:
@@ -543,9 +634,13 @@ def merge_list_by_id(
                 else:
                     report["conflicts_unresolved"].append(conflict_obj)
                 if chosen != old_value:
+                    if not changed:
+                        cur = dict(cur)
                     cur[field] = chosen
                     changed = True
             else:
+                if not changed:
+                    cur = dict(cur)
                 cur[field] = new_value
                 changed = True
 
@@ -565,6 +660,11 @@ def merge_model(
     on_conflict: str,
     resolutions: Dict[str, Any],
 ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Merge `incoming` into `existing` without mutating either.
+
+    The merged model shares every unchanged record with its inputs, so callers
+    must treat all three models as read-only.
+    """
     report: Dict[str, Any] = {
         "status": "ok",
         "created": [],
@@ -582,11 +682,11 @@ def merge_model(
     if mode == "generate":
         merged = inc
     else:
-        merged = deepcopy(ex)
+        merged = dict(ex)
 
         # project metadata (soft update)
         in_project = inc.get("project", {}) if isinstance(inc.get("project"), dict) else {}
-        ex_project = merged.get("project", {}) if isinstance(merged.get("project"), dict) else {}
+        ex_project = dict(merged.get("project", {})) if isinstance(merged.get("project"), dict) else {}
         ex_project.update({k: v for k, v in in_project.items() if v not in (None, "")})
         merged["project"] = ex_project
 
@@ -605,10 +705,11 @@ def merge_model(
                 if not sid:
                     report["warnings"].append("story: skipped item without id")
                     continue
-                st = deepcopy(s)
+                st = s
                 # For new stories we need minimum fields; for existing stories allow patch updates
                 # like only status/progress without forcing fallback values.
                 if sid not in existing_story_ids:
+                    st = dict(s)
                     if not st.get("capability"):
                         st["capability"] = "C-unknown"
                         report["warnings"].append(f"story:{sid} missing capability -> default C-unknown")
@@ -645,6 +746,7 @@ def merge_model(
             resolutions=resolutions,
             report=report,
         )
+        dedupe_depends_on(merged_deps["capabilities"])
         merged_deps["externals"] = merge_list_by_id(
             entity_type="external",
             existing=ex_deps.get("externals", []),
@@ -692,7 +794,7 @@ def merge_model(
         # Architecture: if incoming has details, merge simple by top-level sections
         ex_arch = ex.get("architecture", {}) if isinstance(ex.get("architecture"), dict) else {}
         in_arch = inc.get("architecture", {}) if isinstance(inc.get("architecture"), dict) else {}
-        arch = deepcopy(ex_arch)
+        arch = dict(ex_arch)
         for k, v in in_arch.items():
             if v in (None, "", [], {}):
                 continue
@@ -730,64 +832,149 @@ def merge_model(
     return merged, report
 
 
-def locate_render_script() -> Path:
-    render_path = Path(__file__).resolve().parent / "render_blueprint.py"
-    if not render_path.exists():
-        raise FileNotFoundError(f"render script not found: {render_path}")
-    return render_path
+MANAGED_VIEWS = [
+    "README.md",
+    "Roadmap/Blueprint Tree.md",
+    "Roadmap/Dependencies.md",
+    "Roadmap/Milestones.md",
+    "Architecture/Architecture A - Layers.md",
+    "Architecture/Architecture B - Containers.md",
+    "Stories/README.md",
+]
+
+
+def is_story_output(rel: str) -> bool:
+    name = rel.rsplit("/", 1)[-1]
+    return rel.startswith("Stories/") and name.startswith("US-") and name.endswith(".md")
+
+
+def render_in_memory(
+    model: Dict[str, Any],
+    sections: set | None = None,
+    story_ids: set | None = None,
+) -> Dict[str, str]:
+    """Render the merged model straight to {relative path: AUTO content}."""
+    return render_outputs(model, sections=sections, story_ids=story_ids)
 
 
-def render_to_temp(model: Dict[str, Any]) -> Path:
-    tmp_dir = Path(tempfile.mkdtemp(prefix="blueprint_onboard_render_"))
-    input_path = tmp_dir / "merged-model.yaml"
-    dump_yaml(input_path, model)
+RENDERED_SECTIONS = ["project", "dependencies", "milestones", "architecture", "roadmap_tree"]
+
+
+def changed_sections(existing: Dict[str, Any], merged: Dict[str, Any]) -> Tuple[set, set] | None:
+    """Model sections (and story ids) that differ between two models.
+
+    Relies on merge_model being copy-on-write: an unchanged story is the very
+    same object in both models. Returns None when a full render is needed.
+    """
+    ex = normalize_model(existing)
+    sections = {key for key in RENDERED_SECTIONS if ex.get(key) != merged.get(key)}
+    if "roadmap_tree" in sections:
+        # roadmap_tree can stand in for stories, which is not worth tracking per file.
+        return None
 
-    render_script = locate_render_script()
-    cmd = [
-        "python3",
-        str(render_script),
-        "--input",
-        str(input_path),
-        "--output",
-        str(tmp_dir / "out"),
-        "--overwrite",
-    ]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if result.returncode != 0:
-        raise RuntimeError(f"render failed:\n{result.stdout}\n{result.stderr}")
-    return tmp_dir / "out"
+    ex_stories = [s for s in ex.get("stories", []) if isinstance(s, dict)]
+    new_stories = [s for s in merged.get("stories", []) if isinstance(s, dict)]
+    if not ex_stories or not new_stories:
+        return None if ex_stories != new_stories else (sections, set())
+
+    ex_by_id = {str(s.get("id", "")): s for s in ex_stories}
+    story_ids = set()
+    for story in new_stories:
+        sid = str(story.get("id", ""))
+        old = ex_by_id.get(sid)
+        if old is not story and old != story:
+            story_ids.add(sid)
+    if story_ids or [s.get("id") for s in ex_stories] != [s.get("id") for s in new_stories]:
+        sections.add("stories")
+    return sections, story_ids
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def load_manifest(blueprint_dir: Path) -> Dict[str, Dict[str, Any]]:
+    """Per-file record of what was last written: {rel: {auto_sha256, has_manual, mtime_ns, size}}."""
+    path = blueprint_dir / STATE_DIR / MANIFEST_FILE
+    if not path.exists():
+        return {}
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        return {}
+    files = data.get("files")
+    return files if isinstance(files, dict) else {}
+
+
+def save_manifest(blueprint_dir: Path, files: Dict[str, Dict[str, Any]]) -> None:
+    path = blueprint_dir / STATE_DIR / MANIFEST_FILE
+    ensure_state_dir(path.parent)
+    payload = {"version": MANIFEST_VERSION, "files": dict(sorted(files.items()))}
+    path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+
+
+def manifest_entry(dst: Path, auto_sha: str, has_manual: bool) -> Dict[str, Any]:
+    st = dst.stat()
+    return {"auto_sha256": auto_sha, "has_manual": has_manual, "mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+
+def unchanged_since_manifest(
+    entry: Dict[str, Any] | None,
+    dst: Path,
+    auto_sha: str,
+    keeps_manual: bool,
+) -> bool:
+    """True when `dst` is byte-identical to what composing `auto_sha` would produce, without reading it."""
+    if not entry or entry.get("auto_sha256") != auto_sha:
+        return False
+    if entry.get("has_manual") and not keeps_manual:
+        return False
+    try:
+        st = dst.stat()
+    except FileNotFoundError:
+        return False
+    return entry.get("mtime_ns") == st.st_mtime_ns and entry.get("size") == st.st_size
 
 
 def apply_managed_files(
     blueprint_dir: Path,
-    generated_root: Path,
+    generated: Dict[str, str],
     mode: str,
     dry_run: bool,
-) -> List[str]:
-    expected = [
-        "README.md",
-        "Roadmap/Blueprint Tree.md",
-        "Roadmap/Dependencies.md",
-        "Roadmap/Milestones.md",
-        "Architecture/Architecture A - Layers.md",
-        "Architecture/Architecture B - Containers.md",
-        "Stories/README.md",
-    ]
-
-    # plus all story files produced by renderer
-    story_files = sorted((generated_root / "Stories").glob("US-*.md"))
-    for sf in story_files:
-        expected.append(f"Stories/{sf.name}")
-
+    removals: List[str] | None = None,
+    derived: Callable[[StampAfter], Dict[str, str]] | None = None,
+) -> Tuple[List[str], List[str]]:
+    """Compose and write managed files, skipping those whose bytes would not change.
+
+    Writes, `removals` (relative paths to delete) and the `derived` state
+    files (see `model_state_files`) are committed together through
+    staged_writes, so a crash never leaves a partial set of views.
+
+    Returns: (written, skipped).
+    """
+    # fixed views first, then all story files produced by renderer
+    expected = [rel for rel in MANAGED_VIEWS if rel in generated]
+    expected.extend(sorted(rel for rel in generated if is_story_output(rel)))
+
+    manifest = load_manifest(blueprint_dir)
     written: List[str] = []
+    skipped: List[str] = []
+    pending: Dict[str, str] = {}
+    entries: Dict[str, Tuple[str, bool]] = {}
 
     for rel in expected:
-        src = generated_root / rel
-        if not src.exists():
-            continue
-        auto_content = src.read_text(encoding="utf-8")
+        auto_content = generated[rel]
+        auto_sha = content_hash(auto_content.strip())
+        keeps_manual = mode != "generate" and rel == "README.md"
 
         dst = blueprint_dir / rel
+        if unchanged_since_manifest(manifest.get(rel), dst, auto_sha, keeps_manual):
+            skipped.append(str(dst))
+            continue
+
+        existing_text: str | None = None
         if dst.exists():
             existing_text = dst.read_text(encoding="utf-8")
             parsed = parse_managed_sections(existing_text)
@@ -795,7 +982,7 @@ def apply_managed_files(
                 _, manual_existing = parsed
                 # In generate mode, keep output strictly aligned with the new design input.
                 # Avoid rendering duplicate demo/manual diagrams.
-                manual = manual_existing if (mode != "generate" and rel == "README.md") else ""
+                manual = manual_existing if keeps_manual else ""
             else:
                 # For unmanaged legacy files, don't migrate whole previous content into MANUAL
                 # during generation, otherwise old demo diagrams will render as duplicates.
@@ -804,32 +991,173 @@ def apply_managed_files(
             manual = ""
 
         final_text = compose_managed(auto_content, manual)
-        if not dry_run:
-            dst.parent.mkdir(parents=True, exist_ok=True)
-            dst.write_text(final_text, encoding="utf-8")
-        written.append(str(dst))
+        if final_text == existing_text:
+            skipped.append(str(dst))
+        else:
+            pending[rel] = final_text
+            written.append(str(dst))
+        entries[rel] = (auto_sha, bool(manual.strip()))
 
-    return written
+    if not dry_run:
+        commit_files(blueprint_dir, pending, removals or [], derived)
+        for rel, (auto_sha, has_manual) in entries.items():
+            manifest[rel] = manifest_entry(blueprint_dir / rel, auto_sha, has_manual)
+        for rel in [r for r in manifest if r not in generated and not (blueprint_dir / r).exists()]:
+            del manifest[rel]
+        save_manifest(blueprint_dir, manifest)
 
+    return written, skipped
 
-def prune_stale_story_files(
-    blueprint_dir: Path,
-    generated_root: Path,
-    dry_run: bool,
-) -> List[str]:
+
+def stale_story_files(blueprint_dir: Path, expected: List[str]) -> List[str]:
+    """Relative paths of `Stories/US-*.md` files the model no longer renders."""
     stories_dir = blueprint_dir / "Stories"
     if not stories_dir.exists():
         return []
 
-    keep = {p.name for p in (generated_root / "Stories").glob("US-*.md")}
-    removed: List[str] = []
-    for p in stories_dir.glob("US-*.md"):
-        if p.name in keep:
-            continue
-        if not dry_run:
-            p.unlink(missing_ok=True)
-        removed.append(str(p))
-    return removed
+    keep = {rel.rsplit("/", 1)[-1] for rel in expected if is_story_output(rel)}
+    return sorted(f"Stories/{p.name}" for p in stories_dir.glob("US-*.md") if p.name not in keep)
+
+
+def merge_and_render(
+    blueprint_dir: Path,
+    existing: Dict[str, Any],
+    incoming: Dict[str, Any],
+    *,
+    mode: str,
+    on_conflict: str,
+    resolutions: Dict[str, Any],
+) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, str]]:
+    """Merge `incoming` into `existing` and render the outputs that changed.
+
+    Returns: (report, merged_model, generated_outputs); nothing is written.
+    """
+    merged_model, report = merge_model(
+        existing=existing,
+        incoming=incoming,
+        mode=mode,
+        on_conflict=on_conflict,
+        resolutions=resolutions,
+    )
+    if report["status"] == "needs_resolution":
+        return report, merged_model, {}
+
+    changes = None
+    if mode != "generate" and all((blueprint_dir / rel).exists() for rel in MANAGED_VIEWS):
+        changes = changed_sections(existing, merged_model)
+    if changes is None:
+        return report, merged_model, render_in_memory(merged_model)
+
+    sections, story_ids = changes
+    # Story files that are missing on disk are always (re)rendered.
+    story_ids |= {
+        rel[len("Stories/") : -len(".md")]
+        for rel in output_paths(merged_model)
+        if is_story_output(rel) and not (blueprint_dir / rel).exists()
+    }
+    if story_ids:
+        sections.add("stories")
+    return report, merged_model, render_in_memory(merged_model, sections, story_ids)
+
+
+def run_merge(
+    blueprint_dir: Path,
+    incoming: Dict[str, Any],
+    *,
+    mode: str,
+    on_conflict: str,
+    resolutions: Dict[str, Any],
+    dry_run: bool,
+    existing: Dict[str, Any] | None = None,
+    etag: str | None = None,
+) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, str]]:
+    """Merge `incoming` into the blueprint and write the managed files.
+
+    `existing` skips re-reading the blueprint directory when the caller already
+    holds the current model; `etag` is the `read_model_etag` it was read at.
+    In append mode only the views reading a changed model section (and the
+    files of changed stories) are re-rendered.
+
+    Merging and rendering run without a lock. The commit takes
+    `blueprint_lock` and checks the etag is unchanged; if another writer
+    committed in between, `incoming` is merged again on top of the new model.
+    The last of MERGE_ATTEMPTS holds the lock throughout, so it cannot lose.
+
+    Returns: (result, merged_model, generated_outputs).
+    """
+    for attempt in range(1, MERGE_ATTEMPTS + 1):
+        with ExitStack() as held:
+            pessimistic = attempt == MERGE_ATTEMPTS and not dry_run
+            if pessimistic:
+                held.enter_context(blueprint_lock(blueprint_dir))
+                recover_staged_writes(blueprint_dir)
+                existing = None
+            if existing is None:
+                etag = read_model_etag(blueprint_dir)
+                existing = build_existing_model(blueprint_dir)
+
+            report, merged_model, generated = merge_and_render(
+                blueprint_dir,
+                existing,
+                incoming,
+                mode=mode,
+                on_conflict=on_conflict,
+                resolutions=resolutions,
+            )
+            if report["status"] == "needs_resolution":
+                out = {
+                    "status": "needs_resolution",
+                    "conflicts": report["conflicts_unresolved"],
+                    "report": report,
+                }
+                return out, existing, {}
+
+            if not dry_run and not pessimistic:
+                held.enter_context(blueprint_lock(blueprint_dir))
+                # A rolled-forward crash or another writer's commit changed the
+                # blueprint since it was read: re-merge only our patch.
+                if recover_staged_writes(blueprint_dir) or read_model_etag(blueprint_dir) != etag:
+                    existing = None
+                    continue
+
+            expected = output_paths(merged_model)
+            stale = stale_story_files(blueprint_dir, expected)
+            new_etag, derived = model_state_files(blueprint_dir, merged_model, expected)
+            written, _ = apply_managed_files(
+                blueprint_dir=blueprint_dir,
+                generated=generated,
+                mode=mode,
+                dry_run=dry_run,
+                removals=stale,
+                derived=derived,
+            )
+            if not dry_run:
+                etag = new_etag
+
+        out = {
+            "status": "ok",
+            "dry_run": dry_run,
+            "mode": mode,
+            "report": report,
+            "written_files": written,
+            "rendered_count": len(generated),
+            "written_count": len(written),
+            "skipped_count": len(expected) - len(written),
+            "removed_files": [str(blueprint_dir / rel) for rel in stale],
+            "etag": etag,
+            "attempts": attempt,
+        }
+        return out, merged_model, generated
+    raise AssertionError("unreachable: the last merge attempt holds the lock")
+
+
+def validate_merged(blueprint_dir: Path, generated: Dict[str, str], dry_run: bool) -> Dict[str, Any]:
+    """Validate right after run_merge, reusing the rendered output instead of re-reading it."""
+    from validate_blueprint import validate_blueprint_dir, validation_report
+
+    # A dry run leaves the old files on disk; validate those, as a later run would.
+    issues = validate_blueprint_dir(blueprint_dir, None if dry_run else generated)
+    return validation_report(issues)
 
 
 def main() -> None:
@@ -840,6 +1168,7 @@ def main() -> None:
     parser.add_argument("--on-conflict", choices=["prompt", "keep_old", "use_new"], default="prompt")
     parser.add_argument("--resolutions", help="json file mapping conflict key to resolution")
     parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("--validate", action="store_true", help="validate the blueprint in-process after merging")
     args = parser.parse_args()
 
     input_path = Path(args.input).expanduser().resolve()
@@ -847,47 +1176,21 @@ def main() -> None:
     resolutions = parse_resolutions(Path(args.resolutions).expanduser().resolve()) if args.resolutions else {}
 
     incoming = parse_input_file(input_path)
-    existing = build_existing_model(blueprint_dir)
-
-    merged_model, report = merge_model(
-        existing=existing,
-        incoming=incoming,
+    out, _, generated = run_merge(
+        blueprint_dir,
+        incoming,
         mode=args.mode,
         on_conflict=args.on_conflict,
         resolutions=resolutions,
-    )
-
-    if report["status"] == "needs_resolution":
-        out = {
-            "status": "needs_resolution",
-            "conflicts": report["conflicts_unresolved"],
-            "report": report,
-        }
-        print(dumps_json(out))
-        raise SystemExit(2)
-
-    generated_root = render_to_temp(merged_model)
-    written = apply_managed_files(
-        blueprint_dir=blueprint_dir,
-        generated_root=generated_root,
-        mode=args.mode,
-        dry_run=args.dry_run,
-    )
-    removed_files = prune_stale_story_files(
-        blueprint_dir=blueprint_dir,
-        generated_root=generated_root,
         dry_run=args.dry_run,
     )
-
-    out = {
-        "status": "ok",
-        "dry_run": args.dry_run,
-        "mode": args.mode,
-        "report": report,
-        "written_files": written,
-        "removed_files": removed_files,
-    }
+    if args.validate and out["status"] != "needs_resolution":
+        out["validation"] = validate_merged(blueprint_dir, generated, args.dry_run)
     print(dumps_json(out))
+    if out["status"] == "needs_resolution":
+        raise SystemExit(2)
+    if out.get("validation", {}).get("status") == "failed":
+        raise SystemExit(1)
 
 
 if __name__ == "__main__":
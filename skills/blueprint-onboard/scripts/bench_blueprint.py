@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the Blueprint scripts on synthetic blueprints.
+
+Usage:
+  python3 bench_blueprint.py deps [--edges 1000 2500 5000 10000] [--hubs 5]
+  python3 bench_blueprint.py merge [--stories 5000]
+  python3 bench_blueprint.py rollup [--stories 20000] [--capabilities 400]
+  python3 bench_blueprint.py graph [--edges 10000 20000 40000]
+  python3 bench_blueprint.py startup [--stories 200]
+  python3 bench_blueprint.py frontmatter [--timing-files 2000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+
+def best_of(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def synthetic_dependencies_md(edges: int, hubs: int) -> str:
+    """`edges` capabilities each depending on one of `hubs` hub capabilities (reason per source)."""
+    lines = ["<!-- AUTO:START -->", "# 视图 B：Dependencies（风险视图）", "", "```mermaid", "flowchart LR", ""]
+    for h in range(hubs):
+        lines.append(f'C_H{h:03d}["C-9{h:03d} Hub {h}"]:::normal')
+    for i in range(edges):
+        lines.append(f'C_{i:05d}["C-{i:05d} Capability {i}"]:::normal')
+    lines.append("")
+    for i in range(edges):
+        lines.append(f'C_{i:05d} -->|"needs {i}"| C_H{i % hubs:03d}')
+    lines.append("```")
+    lines.append("<!-- AUTO:END -->")
+    lines.append("")
+    lines.append("<!-- MANUAL:START -->")
+    lines.append("<!-- MANUAL:END -->")
+    return "\n".join(lines) + "\n"
+
+
+def bench_deps(args: argparse.Namespace) -> Dict[str, Any]:
+    from apply_blueprint_merge import parse_dependencies_model
+
+    rows: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory(prefix="blueprint_bench_") as tmp:
+        for n in args.edges:
+            path = Path(tmp) / f"Dependencies-{n}.md"
+            path.write_text(synthetic_dependencies_md(n, args.hubs), encoding="utf-8")
+            seconds = best_of(lambda: parse_dependencies_model(path), args.repeat)
+            rows.append({"edges": n, "seconds": round(seconds, 4), "us_per_edge": round(seconds / n * 1e6, 2)})
+
+    # Linear behaviour keeps us_per_edge roughly flat as the edge count grows.
+    first, last = rows[0], rows[-1]
+    return {
+        "bench": "deps",
+        "hubs": args.hubs,
+        "rows": rows,
+        "per_edge_growth": round(last["us_per_edge"] / first["us_per_edge"], 2) if first["us_per_edge"] else None,
+    }
+
+
+def synthetic_model(stories: int) -> Dict[str, Any]:
+    caps = max(1, stories // 20)
+    return {
+        "project": {"name": "Bench"},
+        "stories": [
+            {
+                "id": f"US-{i:05d}",
+                "epic": f"E-{i % 10:03d}",
+                "capability": f"C-{i % caps:04d}",
+                "milestone": f"M-{i % 6:03d}",
+                "title": f"Story {i}",
+                "status": "todo",
+                "progress": i % 100,
+                "effort": 1 + i % 5,
+                "vibe_tasks": [f"t-{i}-1", f"t-{i}-2"],
+                "acceptance": [f"criterion {j}" for j in range(3)],
+                "notes": {"data_model": "n/a", "api": "n/a", "edge_cases": "n/a", "rollback": "n/a"},
+            }
+            for i in range(stories)
+        ],
+        "dependencies": {
+            "capabilities": [
+                {"id": f"C-{c:04d}", "title": f"Capability {c}", "depends_on": [{"id": f"C-{(c + 1) % caps:04d}"}]}
+                for c in range(caps)
+            ],
+            "externals": [],
+            "edges": [],
+        },
+        "milestones": [{"id": f"M-{m:03d}", "title": f"Milestone {m}", "items": []} for m in range(6)],
+        "architecture": {},
+    }
+
+
+def measure(fn: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    seconds = best_of(fn, repeat)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": round(seconds, 5), "peak_kib": round(peak / 1024, 1)}
+
+
+def bench_merge(args: argparse.Namespace) -> Dict[str, Any]:
+    from apply_blueprint_merge import merge_model
+
+    existing = synthetic_model(args.stories)
+    patch = {"stories": [{"id": "US-00042", "status": "done", "progress": 100}]}
+
+    def run() -> Any:
+        return merge_model(existing, patch, "append", "keep_old", {})
+
+    merged, report = run()
+    shared = sum(1 for a, b in zip(existing["stories"], merged["stories"]) if a is b)
+    return {
+        "bench": "merge",
+        "stories": args.stories,
+        "updated": report["updated"],
+        "shared_story_records": shared,
+        "merge_model": measure(run, args.repeat),
+        # Reference point: what a single full deepcopy of the model costs.
+        "deepcopy_model": measure(lambda: copy.deepcopy(existing), args.repeat),
+    }
+
+
+def legacy_grouped_tree(stories: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Roll-up that re-walks each capability's stories after grouping, as before (reference)."""
+    epic_map: Dict[str, Dict[str, Any]] = {}
+    cap_map: Dict[Any, Dict[str, Any]] = {}
+    for story in stories:
+        epic_id = story.get("epic", "E-001")
+        cap_id = story.get("capability", "C-001")
+        if epic_id not in epic_map:
+            epic_map[epic_id] = {"id": epic_id, "title": story.get("epic_title", "Epic"), "progress": 0, "capabilities": []}
+        key = (epic_id, cap_id)
+        if key not in cap_map:
+            cap_map[key] = {"id": cap_id, "title": story.get("capability_title", "Capability"), "progress": 0, "stories": []}
+            epic_map[epic_id]["capabilities"].append(cap_map[key])
+        cap_map[key]["stories"].append(story)
+
+    for epic in epic_map.values():
+        cap_progress_values = []
+        for cap in epic["capabilities"]:
+            stories_in_cap = cap["stories"]
+            cap["progress"] = (
+                int(round(sum(float(s.get("progress", 0)) for s in stories_in_cap) / len(stories_in_cap)))
+                if stories_in_cap
+                else 0
+            )
+            cap_progress_values.append(cap["progress"])
+        epic["progress"] = int(round(sum(cap_progress_values) / len(cap_progress_values))) if cap_progress_values else 0
+    return list(epic_map.values())
+
+
+def bench_rollup(args: argparse.Namespace) -> Dict[str, Any]:
+    from render_blueprint import grouped_tree_from_stories
+
+    stories = [
+        {
+            "id": f"US-{i:05d}",
+            "epic": f"E-{i % 25:03d}",
+            "capability": f"C-{i % args.capabilities:04d}",
+            "progress": str(i % 101) if i % 7 == 0 else i % 101,
+            "effort": 1 + i % 8,
+        }
+        for i in range(args.stories)
+    ]
+    legacy = legacy_grouped_tree(stories)
+    current = grouped_tree_from_stories(stories)
+    return {
+        "bench": "rollup",
+        "stories": args.stories,
+        "capabilities": args.capabilities,
+        "same_result": legacy == current,
+        "legacy": measure(lambda: legacy_grouped_tree(stories), args.repeat),
+        "current": measure(lambda: grouped_tree_from_stories(stories), args.repeat),
+        "current_effort_weighted": measure(
+            lambda: grouped_tree_from_stories(stories, weight_by_effort=True), args.repeat
+        ),
+    }
+
+
+def bench_graph(args: argparse.Namespace) -> Dict[str, Any]:
+    from dependency_graph import analyze_dependencies
+
+    rows: List[Dict[str, Any]] = []
+    for n in args.edges:
+        caps = max(2, n // 4)
+        # Layered DAG: every capability depends on up to four earlier ones.
+        data = {
+            "dependencies": {
+                "capabilities": [
+                    {"id": f"C-{c:06d}", "title": f"Capability {c}", "depends_on": [f"C-{c - k:06d}" for k in range(1, 5) if c - k >= 0]}
+                    for c in range(caps)
+                ],
+            },
+            "stories": [{"id": f"US-{c:06d}", "capability": f"C-{c:06d}", "effort": 1 + c % 5} for c in range(caps)],
+        }
+        report = analyze_dependencies(data)
+        seconds = best_of(lambda: analyze_dependencies(data), args.repeat)
+        rows.append(
+            {
+                "edges": report["edges"],
+                "nodes": report["nodes"],
+                "seconds": round(seconds, 4),
+                "us_per_edge": round(seconds / max(report["edges"], 1) * 1e6, 2),
+                "critical_path_nodes": len(report["critical_path"]["nodes"]),
+            }
+        )
+    return {"bench": "graph", "rows": rows}
+
+
+def bench_startup(args: argparse.Namespace) -> Dict[str, Any]:
+    """End-to-end `blueprint_cli story-done` in a fresh interpreter, with -X importtime."""
+    from apply_blueprint_merge import run_merge
+
+    cli = Path(__file__).resolve().parent / "blueprint_cli.py"
+    with tempfile.TemporaryDirectory(prefix="blueprint_bench_") as tmp:
+        blueprint_dir = Path(tmp) / "blueprint"
+        run_merge(blueprint_dir, synthetic_model(args.stories), mode="generate", on_conflict="use_new", resolutions={}, dry_run=False)
+
+        # Measure with bytecode caching on, as for a normal install, but keep .pyc files out of the tree.
+        env = {k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"}
+        env["PYTHONPYCACHEPREFIX"] = str(Path(tmp) / "pycache")
+
+        def story_done(i: int, *flags: str) -> subprocess.CompletedProcess:
+            cmd = [sys.executable, *flags, str(cli), "--blueprint-dir", str(blueprint_dir)]
+            cmd += ["story-done", "--id", f"US-{i % args.stories:05d}"]
+            return subprocess.run(cmd, capture_output=True, text=True, env=env)
+
+        story_done(0)  # warm the page cache and .pyc files
+        runs: List[float] = []
+        for i in range(1, args.repeat + 1):
+            start = time.perf_counter()
+            story_done(i)
+            runs.append(time.perf_counter() - start)
+        proc = story_done(args.repeat + 1, "-X", "importtime")
+        bare = best_of(lambda: subprocess.run([sys.executable, "-c", "pass"]), args.repeat)
+
+    # importtime lines: "import time: self [us] | cumulative | imported package"
+    imports: List[Dict[str, Any]] = []
+    for line in proc.stderr.splitlines():
+        parts = line.removeprefix("import time:").split("|")
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            # Nested imports are indented under the module that triggered them.
+            imports.append({"module": parts[2].rstrip()[1:], "cumulative_us": int(parts[1])})
+    top_level = [m for m in imports if not m["module"].startswith(" ")]
+    return {
+        "bench": "startup",
+        "stories": args.stories,
+        "returncode": proc.returncode,
+        "best_seconds": round(min(runs), 4),
+        # Reference point: an interpreter that imports nothing.
+        "bare_interpreter_seconds": round(bare, 4),
+        "yaml_imported": any(m["module"].strip() == "yaml" for m in imports),
+        "import_us_total": sum(m["cumulative_us"] for m in top_level),
+        "slowest_imports": sorted(top_level, key=lambda m: -m["cumulative_us"])[:8],
+    }
+
+
+def bench_frontmatter(args: argparse.Namespace) -> Dict[str, Any]:
+    """fast_frontmatter vs YAML parse timing (equivalence is covered by test_story_loader.py)."""
+    from render_blueprint import story_frontmatter
+    from story_loader import fast_frontmatter
+    from yaml_loader import safe_load
+
+    blocks = [story_frontmatter(s)[4:-5] for s in synthetic_model(args.timing_files)["stories"]]
+    return {
+        "bench": "frontmatter",
+        "timing_files": args.timing_files,
+        "fast_seconds": round(best_of(lambda: [fast_frontmatter(b) for b in blocks], args.repeat), 4),
+        "yaml_seconds": round(best_of(lambda: [safe_load(b) for b in blocks], args.repeat), 4),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark Blueprint scripts on synthetic data")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    sub = parser.add_subparsers(dest="bench", required=True)
+
+    s_deps = sub.add_parser("deps", help="parse_dependencies_model on hub-heavy Dependencies.md")
+    s_deps.add_argument("--edges", type=int, nargs="+", default=[1000, 2500, 5000, 10000])
+    s_deps.add_argument("--hubs", type=int, default=5, help="Number of hub capabilities receiving all edges")
+
+    s_merge = sub.add_parser("merge", help="merge_model applying a one-story patch")
+    s_merge.add_argument("--stories", type=int, default=5000)
+
+    s_rollup = sub.add_parser("rollup", help="grouped_tree_from_stories vs the row-wise reference")
+    s_rollup.add_argument("--stories", type=int, default=20000)
+    s_rollup.add_argument("--capabilities", type=int, default=400)
+
+    s_graph = sub.add_parser("graph", help="analyze_dependencies on layered DAGs")
+    s_graph.add_argument("--edges", type=int, nargs="+", default=[10000, 20000, 40000])
+
+    s_startup = sub.add_parser("startup", help="blueprint_cli story-done end-to-end in a new process")
+    s_startup.add_argument("--stories", type=int, default=200)
+
+    s_fm = sub.add_parser("frontmatter", help="fast_frontmatter vs YAML parse timing")
+    s_fm.add_argument("--timing-files", type=int, default=2000)
+
+    args = parser.parse_args()
+    benches = {
+        "deps": bench_deps,
+        "merge": bench_merge,
+        "rollup": bench_rollup,
+        "graph": bench_graph,
+        "startup": bench_startup,
+        "frontmatter": bench_frontmatter,
+    }
+    print(json.dumps(benches[args.bench](args), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -13,7 +13,10 @@ import json
 import re
 from collections import defaultdict
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from dependency_graph import analyze_dependencies
+from yaml_loader import safe_load
 
 
 def safe_node_id(raw: str) -> str:
@@ -39,12 +42,11 @@ def parse_input_file(path: Path) -> Dict[str, Any]:
         data = json.loads(raw)
     else:
         try:
-            import yaml  # type: ignore
-        except Exception as exc:
+            data = safe_load(raw)
+        except ImportError as exc:
             raise RuntimeError(
                 "YAML input requires pyyaml. Install with: python3 -m pip install --user pyyaml"
             ) from exc
-        data = yaml.safe_load(raw)
 
     if not isinstance(data, dict):
         raise ValueError("Input root must be an object/map.")
@@ -110,20 +112,27 @@ def status_class(status: str) -> str:
     return "todo"
 
 
-def grouped_tree_from_stories(stories: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def grouped_tree_from_stories(stories: List[Dict[str, Any]], weight_by_effort: bool = False) -> List[Dict[str, Any]]:
+    """Group stories into epics -> capabilities and roll progress up.
+
+    Progress sums are accumulated per capability while grouping, in one pass.
+    Capability progress is the mean story progress; epic progress is the mean
+    of its capabilities. With `weight_by_effort`, both are effort-weighted
+    story means instead (falling back to the plain mean when all effort is 0).
+    """
     epic_map: Dict[str, Dict[str, Any]] = {}
     cap_map: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    # Per capability: [story count, progress total, effort total, effort-weighted progress total].
+    cap_sums: Dict[Tuple[str, str], List[float]] = {}
 
     for story in stories:
         epic_id = story.get("epic", "E-001")
         cap_id = story.get("capability", "C-001")
-        epic_title = story.get("epic_title", "Epic")
-        cap_title = story.get("capability_title", "Capability")
 
         if epic_id not in epic_map:
             epic_map[epic_id] = {
                 "id": epic_id,
-                "title": epic_title,
+                "title": story.get("epic_title", "Epic"),
                 "progress": 0,
                 "capabilities": [],
             }
@@ -131,48 +140,61 @@ def grouped_tree_from_stories(stories: List[Dict[str, Any]]) -> List[Dict[str, A
         if key not in cap_map:
             cap_obj = {
                 "id": cap_id,
-                "title": cap_title,
+                "title": story.get("capability_title", "Capability"),
                 "progress": 0,
                 "stories": [],
             }
             cap_map[key] = cap_obj
+            cap_sums[key] = [0, 0.0, 0.0, 0.0]
             epic_map[epic_id]["capabilities"].append(cap_obj)
 
         cap_map[key]["stories"].append(story)
-
-    # Calculate progress from child stories.
+        sums = cap_sums[key]
+        progress = float(story.get("progress", 0))
+        sums[0] += 1
+        sums[1] += progress
+        if weight_by_effort:
+            effort = max(float(story.get("effort", 1)), 0.0)
+            sums[2] += effort
+            sums[3] += progress * effort
+
+    if weight_by_effort:
+        epic_sums: Dict[str, List[float]] = {epic_id: [0, 0.0, 0.0, 0.0] for epic_id in epic_map}
+        for key, sums in cap_sums.items():
+            cap_map[key]["progress"] = _rollup(*sums)
+            acc = epic_sums[key[0]]
+            for i, value in enumerate(sums):
+                acc[i] += value
+        for epic_id, epic in epic_map.items():
+            epic["progress"] = _rollup(*epic_sums[epic_id])
+        return list(epic_map.values())
+
+    for key, (count, total, _, _) in cap_sums.items():
+        cap_map[key]["progress"] = int(round(total / count)) if count else 0
     for epic in epic_map.values():
-        cap_progress_values = []
-        for cap in epic["capabilities"]:
-            stories_in_cap = cap["stories"]
-            if stories_in_cap:
-                cap_progress = int(
-                    round(
-                        sum(float(s.get("progress", 0)) for s in stories_in_cap)
-                        / len(stories_in_cap)
-                    )
-                )
-            else:
-                cap_progress = 0
-            cap["progress"] = cap_progress
-            cap_progress_values.append(cap_progress)
-
+        cap_progress_values = [cap["progress"] for cap in epic["capabilities"]]
         epic["progress"] = (
             int(round(sum(cap_progress_values) / len(cap_progress_values)))
             if cap_progress_values
             else 0
         )
-
     return list(epic_map.values())
 
 
+def _rollup(counts: float, totals: float, weights: float, weighted: float) -> int:
+    if weights > 0:
+        return int(round(weighted / weights))
+    return int(round(totals / counts)) if counts else 0
+
+
 def get_epics_for_tree(data: Dict[str, Any], stories: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     tree = data.get("roadmap_tree", {})
     if isinstance(tree, dict):
         epics = tree.get("epics", [])
         if isinstance(epics, list) and epics:
             return [e for e in epics if isinstance(e, dict)]
-    return grouped_tree_from_stories(stories)
+    project = data.get("project", {}) if isinstance(data.get("project"), dict) else {}
+    return grouped_tree_from_stories(stories, weight_by_effort=project.get("progress_weight") == "effort")
 
 
 def render_blueprint_tree(epics: List[Dict[str, Any]]) -> str:
@@ -323,9 +345,36 @@ def render_dependencies(data: Dict[str, Any]) -> str:
                 lines.append(f"{safe_node_id(from_id)} --> {safe_node_id(to_id)}")
 
     lines.append("```")
+    if capabilities:
+        lines.extend(render_dependency_analysis(data))
     return "\n".join(lines) + "\n"
 
 
+def _effort_text(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else f"{value:.1f}"
+
+
+def render_dependency_analysis(data: Dict[str, Any]) -> List[str]:
+    report = analyze_dependencies(data)
+    lines: List[str] = ["", "## 关键路径（按未完成 Story effort 加权）"]
+    path = report["critical_path"]["nodes"]
+    if path:
+        lines.append("- " + " → ".join(f"{n['id']} {n['title']}".strip() for n in path))
+        lines.append(f"- 剩余 effort：{_effort_text(report['critical_path']['effort'])}")
+    else:
+        lines.append("- （依赖全部处于循环中，无法排序）")
+
+    if report["cycles"]:
+        lines.append("")
+        lines.append("## 循环依赖（需拆解）")
+        for cycle, component in zip(report["cycles"], report["cyclic_components"]):
+            line = "- " + " → ".join(cycle + cycle[:1])
+            if len(component) > len(cycle):
+                line += f"（同一强连通分量：{', '.join(component)}）"
+            lines.append(line)
+    return lines
+
+
 def task_status_prefix(status: str) -> str:
     s = (status or "").lower().strip()
     if s == "doing":
@@ -625,10 +674,29 @@ def render_story_md(story: Dict[str, Any]) -> str:
     return "\n".join(lines)
 
 
-def render_stories(stories: List[Dict[str, Any]], output_dir: Path, overwrite: bool) -> None:
-    stories_dir = output_dir / "Stories"
-    stories_dir.mkdir(parents=True, exist_ok=True)
-
+STORY_TEMPLATE = (
+    "---\n"
+    "id: US-xxx\n"
+    "epic: E-xxx\n"
+    "capability: C-xxx\n"
+    "milestone: M-yyy\n"
+    "title: <Story 标题>\n"
+    "status: todo\n"
+    "progress: 0\n"
+    "effort: 1\n"
+    "openspec_change: <change-id>\n"
+    "vibe_parent_task: <vibe-parent-id>\n"
+    "vibe_tasks: [<vibe-task-id-1>, <vibe-task-id-2>]\n"
+    "---\n\n"
+    "# US-xxx <Story 标题>\n\n"
+    "## User Story\n"
+    "作为：<目标用户>\n"
+    "我想要：<目标能力>\n"
+    "以便于：<业务价值>\n"
+)
+
+
+def render_stories_readme(stories: List[Dict[str, Any]]) -> str:
     lines = ["# Stories（叶子 User Stories）", ""]
     if stories:
         lines.append("当前故事：")
@@ -643,49 +711,46 @@ def render_stories(stories: List[Dict[str, Any]], output_dir: Path, overwrite: b
     lines.append("- `capability`")
     lines.append("- `milestone`")
     lines.append("")
-    write_file(stories_dir / "README.md", "\n".join(lines), overwrite)
+    return "\n".join(lines)
 
-    if not stories:
-        stories = [
-            {
-                "id": "US-001",
-                "epic": "E-001",
-                "capability": "C-001",
-                "milestone": "M-yyy",
-                "title": "示例 Story",
-                "status": "todo",
-                "progress": 0,
-            }
-        ]
 
-    for s in stories:
-        if not isinstance(s, dict):
-            continue
-        story_id = str(s.get("id", "US-001"))
-        path = stories_dir / f"{story_id}.md"
-        write_file(path, render_story_md(s), overwrite)
+def stories_for_files(stories: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    if stories:
+        return [s for s in stories if isinstance(s, dict)]
+    return [
+        {
+            "id": "US-001",
+            "epic": "E-001",
+            "capability": "C-001",
+            "milestone": "M-yyy",
+            "title": "示例 Story",
+            "status": "todo",
+            "progress": 0,
+        }
+    ]
+
+
+def story_path(story: Dict[str, Any]) -> str:
+    return f"Stories/{story.get('id', 'US-001')}.md"
 
-    template = (
-        "---\n"
-        "id: US-xxx\n"
-        "epic: E-xxx\n"
-        "capability: C-xxx\n"
-        "milestone: M-yyy\n"
-        "title: <Story 标题>\n"
-        "status: todo\n"
-        "progress: 0\n"
-        "effort: 1\n"
-        "openspec_change: <change-id>\n"
-        "vibe_parent_task: <vibe-parent-id>\n"
-        "vibe_tasks: [<vibe-task-id-1>, <vibe-task-id-2>]\n"
-        "---\n\n"
-        "# US-xxx <Story 标题>\n\n"
-        "## User Story\n"
-        "作为：<目标用户>\n"
-        "我想要：<目标能力>\n"
-        "以便于：<业务价值>\n"
-    )
-    write_file(stories_dir / "US-xxx.md", template, overwrite)
+
+def render_story_outputs(stories: List[Dict[str, Any]], story_ids: Optional[Set[str]] = None) -> Dict[str, str]:
+    """Render `Stories/*` as {relative path: content}.
+
+    With `story_ids`, only those story files are rendered (no README/template).
+    """
+    if story_ids is not None:
+        return {
+            story_path(s): render_story_md(s)
+            for s in stories_for_files(stories)
+            if str(s.get("id", "US-001")) in story_ids
+        }
+
+    outputs: Dict[str, str] = {"Stories/README.md": render_stories_readme(stories)}
+    for s in stories_for_files(stories):
+        outputs[story_path(s)] = render_story_md(s)
+    outputs["Stories/US-xxx.md"] = STORY_TEMPLATE
+    return outputs
 
 
 def _to_lines(value: Any) -> List[str]:
@@ -706,6 +771,23 @@ def _section(title: str, items: List[str]) -> str:
     return "\n".join(lines)
 
 
+STORY_GROUP_FIELDS = ("epic", "capability", "milestone")
+
+
+def group_stories(stories: List[Dict[str, Any]]) -> Dict[str, Dict[str, List[str]]]:
+    """{field: {value: [story ids]}} for each STORY_GROUP_FIELDS field, in one pass."""
+    groups: Dict[str, Dict[str, List[str]]] = {field: {} for field in STORY_GROUP_FIELDS}
+    for s in stories:
+        if not isinstance(s, dict):
+            continue
+        story_id = str(s.get("id", "")).strip()
+        for field, by_value in groups.items():
+            value = str(s.get(field, "")).strip()
+            if value:
+                by_value.setdefault(value, []).append(story_id)
+    return groups
+
+
 def render_readme(data: Dict[str, Any], project_name: str, stories: List[Dict[str, Any]]) -> str:
     project = data.get("project", {}) if isinstance(data.get("project"), dict) else {}
     design_doc = project.get("design_doc", {}) if isinstance(project.get("design_doc"), dict) else {}
@@ -722,10 +804,9 @@ def render_readme(data: Dict[str, Any], project_name: str, stories: List[Dict[st
     doc_acceptance = _to_lines(design_doc.get("acceptance"))
 
     story_count = len([s for s in stories if isinstance(s, dict)])
-    epic_count = len({str(s.get("epic", "")).strip() for s in stories if isinstance(s, dict) and str(s.get("epic", "")).strip()})
-    capability_count = len(
-        {str(s.get("capability", "")).strip() for s in stories if isinstance(s, dict) and str(s.get("capability", "")).strip()}
-    )
+    groups = group_stories(stories)
+    epic_count = len(groups["epic"])
+    capability_count = len(groups["capability"])
     milestone_count = len(
         {
             str(m.get("id", "")).strip()
@@ -799,6 +880,65 @@ def render_readme(data: Dict[str, Any], project_name: str, stories: List[Dict[st
     return text
 
 
+# Model sections read by each view. `Stories/US-*.md` files read only their own story.
+VIEW_SECTIONS: Dict[str, Set[str]] = {
+    "README.md": {"project", "stories", "milestones"},
+    "Roadmap/Blueprint Tree.md": {"project", "stories", "roadmap_tree"},
+    "Roadmap/Dependencies.md": {"dependencies", "stories"},
+    "Roadmap/Milestones.md": {"milestones"},
+    "Architecture/Architecture A - Layers.md": {"architecture"},
+    "Architecture/Architecture B - Containers.md": {"architecture"},
+    "Stories/README.md": {"stories"},
+}
+
+
+def output_paths(data: Dict[str, Any]) -> List[str]:
+    """Every relative path a full render of `data` produces."""
+    paths = list(VIEW_SECTIONS)
+    paths.extend(story_path(s) for s in stories_for_files(to_story_list(data)))
+    paths.append("Stories/US-xxx.md")
+    return paths
+
+
+def render_outputs(
+    data: Dict[str, Any],
+    project_name: str = "Project",
+    *,
+    sections: Optional[Set[str]] = None,
+    story_ids: Optional[Set[str]] = None,
+) -> Dict[str, str]:
+    """Render Blueprint views in memory as {relative path: content}.
+
+    By default every view and story file is rendered. With `sections`, only
+    views reading one of those model sections are rendered; story files are
+    rendered when "stories" is among them, limited to `story_ids` if given.
+    `project.name` in `data` takes precedence over `project_name`.
+    """
+    project = data.get("project", {}) if isinstance(data.get("project"), dict) else {}
+    project_name = str(project.get("name", project_name))
+
+    stories = to_story_list(data)
+    views: Dict[str, Callable[[], str]] = {
+        "README.md": lambda: render_readme(data, project_name, stories),
+        "Roadmap/Blueprint Tree.md": lambda: render_blueprint_tree(get_epics_for_tree(data, stories)),
+        "Roadmap/Dependencies.md": lambda: render_dependencies(data),
+        "Roadmap/Milestones.md": lambda: render_milestones(data),
+        "Architecture/Architecture A - Layers.md": lambda: render_architecture_a(data),
+        "Architecture/Architecture B - Containers.md": lambda: render_architecture_b(data),
+    }
+
+    outputs: Dict[str, str] = {}
+    for rel, render in views.items():
+        if sections is None or VIEW_SECTIONS[rel] & sections:
+            outputs[rel] = render()
+    if sections is None:
+        outputs.update(render_story_outputs(stories))
+    elif "stories" in sections:
+        outputs["Stories/README.md"] = render_stories_readme(stories)
+        outputs.update(render_story_outputs(stories, story_ids))
+    return outputs
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Render Blueprint V3 files from structured input.")
     parser.add_argument("--input", required=True, help="Path to blueprint input (.yaml/.yml/.json)")
@@ -810,23 +950,14 @@ def main() -> None:
     output_dir = Path(args.output).expanduser().resolve()
 
     data = parse_input_file(input_path)
-    project = data.get("project", {}) if isinstance(data.get("project"), dict) else {}
-    project_name = str(project.get("name", output_dir.parent.name if output_dir.name == "blueprint" else "Project"))
-
-    stories = to_story_list(data)
-    epics = get_epics_for_tree(data, stories)
+    default_name = output_dir.parent.name if output_dir.name == "blueprint" else "Project"
 
     (output_dir / "Roadmap").mkdir(parents=True, exist_ok=True)
     (output_dir / "Architecture").mkdir(parents=True, exist_ok=True)
     (output_dir / "Stories").mkdir(parents=True, exist_ok=True)
 
-    write_file(output_dir / "README.md", render_readme(data, project_name, stories), args.overwrite)
-    write_file(output_dir / "Roadmap/Blueprint Tree.md", render_blueprint_tree(epics), args.overwrite)
-    write_file(output_dir / "Roadmap/Dependencies.md", render_dependencies(data), args.overwrite)
-    write_file(output_dir / "Roadmap/Milestones.md", render_milestones(data), args.overwrite)
-    write_file(output_dir / "Architecture/Architecture A - Layers.md", render_architecture_a(data), args.overwrite)
-    write_file(output_dir / "Architecture/Architecture B - Containers.md", render_architecture_b(data), args.overwrite)
-    render_stories(stories, output_dir, args.overwrite)
+    for rel, content in render_outputs(data, default_name).items():
+        write_file(output_dir / rel, content, args.overwrite)
 
     print("done: blueprint rendered")
     print(f"input: {input_path}")
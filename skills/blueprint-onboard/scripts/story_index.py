@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Compact on-disk index of story metadata.
+
+`.blueprint-state/story-index.json` holds one row per story (sorted by id)
+plus epic/capability/milestone → story id groups. It is rewritten after every
+merge, so lookups such as "stories of C-012" never open story files. The
+index records the mtime/size of each `Stories/US-*.md`; a hand edit makes it
+stale and `load_story_index` returns None.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+from render_blueprint import group_stories
+from story_loader import STATE_DIR, ensure_state_dir, scan_story_stamps
+
+INDEX_FILE = "story-index.json"
+INDEX_VERSION = 1
+INDEX_COLUMNS = ["id", "epic", "capability", "milestone", "status", "progress", "effort", "title"]
+
+
+def build_story_index(stories: List[Dict[str, Any]], stamps: Dict[str, List[int]]) -> Dict[str, Any]:
+    records = sorted((s for s in stories if isinstance(s, dict)), key=lambda s: str(s.get("id", "")))
+    groups = group_stories(records)
+    return {
+        "version": INDEX_VERSION,
+        "columns": INDEX_COLUMNS,
+        "rows": [[s.get(col) for col in INDEX_COLUMNS] for s in records],
+        "groups": groups,
+        "files": stamps,
+    }
+
+
+def dump_story_index(index: Dict[str, Any]) -> str:
+    return json.dumps(index, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def save_story_index(blueprint_dir: Path, stories: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Rebuild the index from the story files as they are on disk now (outside a merge commit)."""
+    index = build_story_index(stories, scan_story_stamps(blueprint_dir / "Stories"))
+    path = blueprint_dir / STATE_DIR / INDEX_FILE
+    ensure_state_dir(path.parent)
+    path.write_text(dump_story_index(index), encoding="utf-8")
+    return index
+
+
+def load_story_index(blueprint_dir: Path) -> Dict[str, Any] | None:
+    """Return the index if no story file was added, removed or edited since it was saved."""
+    path = blueprint_dir / STATE_DIR / INDEX_FILE
+    try:
+        index = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    if not isinstance(index, dict) or index.get("version") != INDEX_VERSION or index.get("columns") != INDEX_COLUMNS:
+        return None
+    if index.get("files") != scan_story_stamps(blueprint_dir / "Stories"):
+        return None
+    return index
+
+
+def query_stories(index: Dict[str, Any], **filters: str | None) -> List[Dict[str, Any]]:
+    """Rows matching every given filter (`id`, `status` or any group field), as dicts."""
+    columns = index["columns"]
+    id_pos, status_pos = columns.index("id"), columns.index("status")
+
+    ids: set | None = None
+    for field, by_value in index["groups"].items():
+        value = filters.get(field)
+        if value:
+            matched = set(by_value.get(value, []))
+            ids = matched if ids is None else ids & matched
+
+    wanted_id, wanted_status = filters.get("id"), filters.get("status")
+    return [
+        dict(zip(columns, row))
+        for row in index["rows"]
+        if (ids is None or row[id_pos] in ids)
+        and (not wanted_id or row[id_pos] == wanted_id)
+        and (not wanted_status or row[status_pos] == wanted_status)
+    ]
+
+
+def count_stories(rows: List[Dict[str, Any]], field: str) -> Dict[str, int]:
+    counts: Dict[str, int] = {}
+    for row in rows:
+        key = str(row.get(field) or "")
+        counts[key] = counts.get(key, 0) + 1
+    return dict(sorted(counts.items()))